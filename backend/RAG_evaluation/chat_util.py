@@ -7,15 +7,43 @@ to generate RAG responses for evaluation.
 
 import json
 import base64
+import importlib.util
 import logging
 import httpx
-import asyncio
+import threading
 import time
 from typing import Dict, List, Any, Tuple, AsyncGenerator, Optional
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("rag_evaluation")
 
+# HTTP/2 needs the optional "h2" package (httpx[http2]); fall back to HTTP/1.1 without it
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def dump_logs(path: str, logs: List[Dict[str, Any]]) -> None:
+    """Write instrumentation log entries to a JSON Lines file.
+
+    Entries are serialized one at a time (with orjson when it is installed),
+    so large logs never have to be rendered into a single JSON string.
+
+    Args:
+        path: Destination file
+        logs: Log entries as returned by RagChatUtil.get_logs()
+    """
+    with open(path, "wb") as f:
+        for entry in logs:
+            if orjson is not None:
+                f.write(orjson.dumps(entry, default=str))
+            else:
+                f.write(json.dumps(entry, default=str).encode("utf-8"))
+            f.write(b"\n")
+
 
 class RagChatUtil:
     """Utility for interacting with Akvo RAG API to generate responses for evaluation."""
@@ -25,6 +53,9 @@ class RagChatUtil:
         base_url: str = "http://localhost:8000",
         username: str = None,
         password: str = None,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        http2: Optional[bool] = None,
     ):
         """Initialize the RAG chat utility.
 
@@ -32,14 +63,28 @@ class RagChatUtil:
             base_url: Base URL of the Akvo RAG API
             username: Username for authentication
             password: Password for authentication
+            max_connections: Maximum number of pooled connections
+            max_keepalive_connections: Maximum number of idle keep-alive connections
+            http2: Negotiate HTTP/2 when the server supports it (defaults to
+                enabled whenever the h2 package is installed)
         """
         self.base_url = base_url
         self.username = username
         self.password = password
         self.token = None
-        self.client = httpx.AsyncClient(timeout=60.0)
+        # Single pooled client shared by every request made through this utility
+        self.client = httpx.AsyncClient(
+            timeout=60.0,
+            http2=_HTTP2_AVAILABLE if http2 is None else http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
         self.instrumentation_enabled = False
         self.logs = []
+        # Guards the swap in drain_logs() against appends from other threads
+        self._logs_lock = threading.Lock()
 
         # Log initialization details
         logger.info(f"=== RAG CHAT UTIL INITIALIZED ===")
@@ -47,6 +92,19 @@ class RagChatUtil:
         logger.info(f"Username: '{username}'")
         logger.info(f"Password: {'***' if password else 'None'}")
 
+    async def __aenter__(self) -> "RagChatUtil":
+        """Open the session, logging in once so the token is reused by all calls."""
+        if not self.token:
+            await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying HTTP client and its pooled connections."""
+        await self.client.aclose()
+
     def enable_instrumentation(self):
         """Enable instrumentation for logging API interactions."""
         self.instrumentation_enabled = True
@@ -56,6 +114,12 @@ class RagChatUtil:
         """Get the logs collected during API interactions."""
         return self.logs
 
+    def drain_logs(self) -> List[Dict[str, Any]]:
+        """Return the collected logs and start a fresh buffer, without copying."""
+        with self._logs_lock:
+            logs, self.logs = self.logs, []
+        return logs
+
     def _log(self, operation: str, inputs: Any, outputs: Any):
         """Log an operation with inputs and outputs.
 
@@ -65,24 +129,24 @@ class RagChatUtil:
             outputs: Output data
         """
         if self.instrumentation_enabled:
-            self.logs.append(
-                {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "operation": operation,
-                    "inputs": (
-                        inputs
-                        if not isinstance(inputs, dict)
-                        or len(str(inputs)) < 1000
-                        else "...(truncated)"
-                    ),
-                    "outputs": (
-                        outputs
-                        if not isinstance(outputs, dict)
-                        or len(str(outputs)) < 1000
-                        else "...(truncated)"
-                    ),
-                }
-            )
+            entry = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "operation": operation,
+                "inputs": (
+                    inputs
+                    if not isinstance(inputs, dict)
+                    or len(str(inputs)) < 1000
+                    else "...(truncated)"
+                ),
+                "outputs": (
+                    outputs
+                    if not isinstance(outputs, dict)
+                    or len(str(outputs)) < 1000
+                    else "...(truncated)"
+                ),
+            }
+            with self._logs_lock:
+                self.logs.append(entry)
             logger.info(f"Operation: {operation}")
 
     async def login(self) -> bool:
@@ -111,6 +175,8 @@ class RagChatUtil:
         try:
             response = await self.client.post(login_url, data=payload)
             logger.info(f"Login response: status={response.status_code}")
+            # First request of the session: shows whether HTTP/2 was negotiated
+            logger.debug(f"RAG API connection protocol: {response.http_version}")
 
             if response.status_code == 200:
                 token_data = response.json()
@@ -533,23 +599,26 @@ class RagChatUtil:
             yield error, {}
 
     async def generate_rag_response(
-        self, query: str, kb_name: str
+        self, query: str, kb_name: str, kb: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Generate a RAG response for evaluation
 
         Args:
             query: The query to send
             kb_name: The name of the knowledge base to use
+            kb: Optional pre-fetched knowledge base, skips the per-query lookup
 
         Returns:
             Dictionary with query, response, retrieval context, and response time
+            (monotonic elapsed seconds as a float, measured with time.perf_counter)
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
-        # Get KB by name
-        kb = await self.get_knowledge_base_by_name(kb_name)
+        # Get KB by name unless the caller already resolved it
+        if kb is None:
+            kb = await self.get_knowledge_base_by_name(kb_name)
         if not kb:
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             return {
                 "query": query,
                 "response": f"Error: Knowledge base '{kb_name}' not found",
@@ -561,7 +630,7 @@ class RagChatUtil:
         # Create chat
         chat = await self.create_chat([kb["id"]])
         if not chat:
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             return {
                 "query": query,
                 "response": "Error: Failed to create chat",
@@ -585,7 +654,7 @@ class RagChatUtil:
             ):
                 contexts = context_data["context"]
 
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
 
         return {
             "query": query,
@@ -595,142 +664,3 @@ class RagChatUtil:
             "chat_id": chat["id"],
             "response_time": response_time,
         }
-
-    async def generate_rag_responses_batch(
-        self,
-        queries: List[str],
-        kb_name: str,
-        batch_size: int = 5,
-        max_concurrent: int = 3,
-    ) -> List[Dict[str, Any]]:
-        """Generate RAG responses for multiple queries with batching and concurrency control.
-
-        Args:
-            queries: List of query strings
-            kb_name: Name of the knowledge base
-            batch_size: Number of queries to process in each batch
-            max_concurrent: Maximum number of concurrent requests per batch
-
-        Returns:
-            List of response dictionaries
-        """
-        # Cache knowledge base lookup
-        kb = await self.get_knowledge_base_by_name(kb_name)
-        if not kb:
-            # Return error for all queries
-            error_result = {
-                "response": f"Error: Knowledge base '{kb_name}' not found",
-                "contexts": [],
-                "error": f"Knowledge base '{kb_name}' not found",
-                "response_time": 0,
-            }
-            return [{**error_result, "query": query} for query in queries]
-
-        # Process queries in batches
-        all_results = []
-        for i in range(0, len(queries), batch_size):
-            batch = queries[i : i + batch_size]
-            logger.info(
-                f"Processing batch {i//batch_size + 1}/{(len(queries) + batch_size - 1)//batch_size}: {len(batch)} queries"
-            )
-
-            # Limit concurrency within batch
-            semaphore = asyncio.Semaphore(max_concurrent)
-
-            async def process_single_query(query: str) -> Dict[str, Any]:
-                async with semaphore:
-                    return await self._generate_single_rag_response_cached_kb(
-                        query, kb
-                    )
-
-            # Process batch concurrently
-            batch_tasks = [process_single_query(query) for query in batch]
-            batch_results = await asyncio.gather(
-                *batch_tasks, return_exceptions=True
-            )
-
-            # Handle exceptions
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    logger.error(
-                        f"Error processing query '{batch[j]}': {str(result)}"
-                    )
-                    batch_results[j] = {
-                        "query": batch[j],
-                        "response": f"Error: {str(result)}",
-                        "contexts": [],
-                        "error": str(result),
-                        "response_time": 0,  # Unknown time for exceptions
-                    }
-
-            all_results.extend(batch_results)
-
-            # Small delay between batches to be nice to the API
-            if i + batch_size < len(queries):
-                await asyncio.sleep(0.5)
-
-        return all_results
-
-    async def _generate_single_rag_response_cached_kb(
-        self, query: str, kb: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Generate RAG response for a single query with cached knowledge base info.
-
-        Args:
-            query: Query string
-            kb: Knowledge base dictionary (pre-fetched)
-
-        Returns:
-            Response dictionary with timing information
-        """
-        start_time = time.time()
-
-        try:
-            # Create chat for this query
-            chat = await self.create_chat([kb["id"]])
-            if not chat:
-                response_time = time.time() - start_time
-                return {
-                    "query": query,
-                    "response": "Error: Failed to create chat",
-                    "contexts": [],
-                    "error": "Failed to create chat",
-                    "response_time": response_time,
-                }
-
-            # Send message and collect response
-            full_response = ""
-            contexts = []
-
-            async for text_chunk, context_data in self.send_message(
-                chat["id"], query
-            ):
-                full_response += text_chunk
-                if (
-                    context_data
-                    and "context" in context_data
-                    and context_data["context"]
-                ):
-                    contexts = context_data["context"]
-
-            response_time = time.time() - start_time
-
-            return {
-                "query": query,
-                "response": full_response,
-                "contexts": contexts,
-                "kb_id": kb["id"],
-                "chat_id": chat["id"],
-                "response_time": response_time,
-            }
-
-        except Exception as e:
-            response_time = time.time() - start_time
-            logger.error(f"Error processing query '{query}': {str(e)}")
-            return {
-                "query": query,
-                "response": f"Error: {str(e)}",
-                "contexts": [],
-                "error": str(e),
-                "response_time": response_time,
-            }
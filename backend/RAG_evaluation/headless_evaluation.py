@@ -6,11 +6,22 @@ independent of any user interface.
 """
 
 import asyncio
+import csv
+import functools
+import hashlib
+import json
 import logging
+import math
+import operator
 import os
+import threading
 import time
+import traceback
+from datetime import datetime
+import httpx
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,119 +29,298 @@ logger = logging.getLogger("rag_evaluation")
 
 # Import our chat utility and performance monitoring
 from chat_util import RagChatUtil
-from performance_monitor import get_monitor
+from performance_monitor import get_monitor, reset_monitor
+from response_cache import DEFAULT_CACHE_PATH, DEFAULT_CACHE_TAG, ResponseCache
 
-# Default test questions
-DEFAULT_TEST_QUERIES = [
+# Import RAGAS once at module load; setup_ragas() reports if it is unavailable
+try:
+    import ragas
+    from ragas import evaluate, EvaluationDataset
+    from ragas.metrics import (
+        Faithfulness, AnswerRelevancy,
+        LLMContextPrecisionWithoutReference, ContextRelevance,
+        AnswerSimilarity, AnswerCorrectness,
+        ContextPrecision, ContextRecall
+    )
+    from ragas.llms import LangchainLLMWrapper
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+    from ragas.run_config import RunConfig
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+    # Metric class for each metric name used in this module
+    _METRIC_CLASSES: Dict[str, Any] = {
+        "faithfulness": Faithfulness,
+        "answer_relevancy": AnswerRelevancy,
+        "context_precision_without_reference": LLMContextPrecisionWithoutReference,
+        "context_relevancy": ContextRelevance,
+        "answer_similarity": AnswerSimilarity,
+        "answer_correctness": AnswerCorrectness,
+        "context_precision": ContextPrecision,
+        "context_recall": ContextRecall,
+    }
+    _RAGAS_AVAILABLE = True
+    _RAGAS_IMPORT_ERROR = None
+except ImportError as e:
+    _METRIC_CLASSES = {}
+    _RAGAS_AVAILABLE = False
+    _RAGAS_IMPORT_ERROR = e
+
+# RAGAS' disk cache backend only exists in newer releases (and needs diskcache)
+try:
+    from ragas.cache import DiskCacheBackend
+except ImportError:
+    DiskCacheBackend = None
+
+# Parse evaluation CSVs with pyarrow's multithreaded C++ reader when it is installed
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
+# Drive evaluation loops with uvloop when it is installed. Only loops created here
+# use it: the global policy is left alone, so Streamlit and the event loops RAGAS
+# starts in its worker threads keep the stock asyncio loop
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+# Maximum concurrent RAG API requests, overridable for headless runs
+DEFAULT_MAX_CONCURRENT = int(os.getenv("RAG_EVAL_CONCURRENCY", "3"))
+
+# Concurrent metric x sample jobs RAGAS may run against the evaluation LLM
+RAGAS_MAX_WORKERS = int(os.getenv("RAG_EVAL_RAGAS_WORKERS", "16"))
+
+# Pipeline chunks RAGAS may score at the same time (each with RAGAS_MAX_WORKERS jobs)
+RAGAS_MAX_CONCURRENT_CHUNKS = int(os.getenv("RAG_EVAL_RAGAS_CHUNKS", "1"))
+
+# Output token limit of the evaluation LLM; 1024 leaves room for the per-statement
+# verdict JSON RAGAS asks for on long answers, which a lower limit can cut short
+EVALUATION_LLM_MAX_TOKENS = int(os.getenv("RAG_EVAL_LLM_MAX_TOKENS", "1024"))
+
+# Event loop reused by successive synchronous run_headless_evaluation() calls
+_EVENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Guards the module-level memo caches below, which chunks scored on worker
+# threads read and update concurrently
+_MEMO_LOCK = threading.Lock()
+
+# On-disk cache of evaluation LLM and embedding calls, so re-scoring an unchanged
+# sample is a local lookup instead of an OpenAI request (empty string disables it)
+RAGAS_CACHE_DIR = os.getenv("RAG_EVAL_LLM_CACHE", ".ragas_cache")
+
+# Metric names per evaluation mode, resolved once at import
+BASIC_METRICS: Tuple[str, ...] = (
+    "faithfulness", "answer_relevancy", "context_precision_without_reference", "context_relevancy"
+)
+REFERENCE_METRICS: Tuple[str, ...] = (
+    "answer_similarity", "answer_correctness", "context_precision", "context_recall"
+)
+
+# (dataset, llm, metric names, results) of the last evaluate_all_metrics() call
+_LAST_FUSED_EVALUATION: Optional[Tuple[Any, Any, Tuple[str, ...], Dict[str, List[float]]]] = None
+
+# RAGAS score column for each metric name used in this module
+_RAGAS_SCORE_KEYS: Dict[str, str] = {
+    "faithfulness": "faithfulness",
+    "answer_relevancy": "answer_relevancy",
+    "context_precision_without_reference": "llm_context_precision_without_reference",
+    "context_relevancy": "nv_context_relevance",
+    "answer_similarity": "semantic_similarity",
+    "answer_correctness": "answer_correctness",
+    "context_precision": "context_precision",
+    "context_recall": "context_recall",
+}
+
+# (needs contexts, needs reference answers) for each metric name
+_METRIC_REQUIREMENTS: Dict[str, Tuple[bool, bool]] = {
+    "faithfulness": (False, False),
+    "answer_relevancy": (False, False),
+    "context_precision_without_reference": (True, False),
+    "context_relevancy": (True, False),
+    "answer_similarity": (False, True),
+    "answer_correctness": (False, True),
+    "context_precision": (True, True),
+    "context_recall": (True, True),
+}
+
+# Metric instances keyed by (metric, thread), see _metric_for()
+_METRIC_INSTANCES: Dict[Tuple[str, int], Any] = {}
+_METRIC_INSTANCES_SIZE = 32
+
+# Columns of the per-sample RAGAS checkpoint CSV
+_CHECKPOINT_COLUMNS = ["sample_hash", *BASIC_METRICS, *REFERENCE_METRICS]
+_CHECKPOINT_LOCK = threading.Lock()
+
+# Default test questions (immutable so the shared default can never be mutated)
+DEFAULT_TEST_QUERIES: Tuple[str, ...] = (
     "What is the living income benchmark?",
     "How is the living income benchmark calculated?",
     "What factors influence the living income benchmark?",
     "How does the living income benchmark differ from minimum wage?",
-    "What is the purpose of establishing a living income benchmark?"
-]
+    "What is the purpose of establishing a living income benchmark?",
+)
+
+# Accepted CSV column names, in order of preference
+PROMPT_COLUMNS: Tuple[str, ...] = ("prompt", "query", "question")
+REFERENCE_COLUMNS: Tuple[str, ...] = ("reference_answer", "reference", "ground_truth", "answer", "expected_answer")
+# Only these columns are ever parsed out of an evaluation CSV
+_CSV_COLUMNS = frozenset(PROMPT_COLUMNS + REFERENCE_COLUMNS)
 
-def detect_csv_format(df: pd.DataFrame) -> Tuple[bool, bool, Optional[str]]:
+def detect_csv_format(df: pd.DataFrame) -> Tuple[bool, bool, Optional[str], Optional[str], Optional[str]]:
     """Detect CSV format and validate structure.
     
     Args:
         df: Pandas DataFrame from CSV
         
     Returns:
-        Tuple of (has_prompts, has_references, error_message)
+        Tuple of (has_prompts, has_references, error_message, prompt_column,
+        reference_column); the reference column is None when it is absent or empty
     """
-    # Check for required prompt column
-    prompt_columns = ['prompt', 'query', 'question']
-    prompt_col = None
-    for col in prompt_columns:
-        if col in df.columns:
-            prompt_col = col
-            break
+    columns = set(df.columns)
     
+    # Check for required prompt column
+    prompt_col = next((col for col in PROMPT_COLUMNS if col in columns), None)
     if not prompt_col:
-        return False, False, f"CSV must contain one of these columns: {', '.join(prompt_columns)}"
+        return False, False, f"CSV must contain one of these columns: {', '.join(PROMPT_COLUMNS)}", None, None
     
     # Check for reference answer columns
-    reference_columns = ['reference_answer', 'reference', 'ground_truth', 'answer']
-    reference_col = None
-    for col in reference_columns:
-        if col in df.columns:
-            reference_col = col
-            break
-    
-    has_references = reference_col is not None
+    reference_col = next((col for col in REFERENCE_COLUMNS if col in columns), None)
     
     # Validate data
     if df.empty:
-        return False, False, "CSV file is empty"
+        return False, False, "CSV file is empty", None, None
     
     # Check if prompt column has data
-    non_empty_prompts = df[prompt_col].dropna().str.strip().astype(bool).sum()
+    non_empty_prompts = df[prompt_col].dropna().astype(str).str.strip().astype(bool).sum()
     if non_empty_prompts == 0:
-        return False, False, f"No valid prompts found in '{prompt_col}' column"
+        return False, False, f"No valid prompts found in '{prompt_col}' column", None, None
     
     # If we have references, check if they have data
-    if has_references:
-        non_empty_refs = df[reference_col].dropna().str.strip().astype(bool).sum()
+    if reference_col is not None:
+        non_empty_refs = df[reference_col].dropna().astype(str).str.strip().astype(bool).sum()
         if non_empty_refs == 0:
-            has_references = False  # References column exists but is empty
+            reference_col = None  # References column exists but is empty
+    
+    return True, reference_col is not None, None, prompt_col, reference_col
+
+def parse_csv_queries_fast(path: str) -> Tuple[List[str], Optional[List[str]], Optional[str]]:
+    """Parse queries and optional reference answers straight from a CSV file.
+    
+    Uses pyarrow's CSV reader and string kernels; only the prompt and
+    reference columns are parsed (as strings, skipping type inference) and
+    converted to Python strings. Falls back to pandas, restricted to the
+    same columns, when pyarrow is not installed.
+    
+    Args:
+        path: Path to the CSV file
+        
+    Returns:
+        Tuple of (queries, reference_answers, error_message)
+    """
+    if not _PYARROW_AVAILABLE:
+        try:
+            df = pd.read_csv(path, dtype=str, usecols=lambda col: col in _CSV_COLUMNS)
+        except Exception as e:
+            return [], None, f"Error reading CSV file: {str(e)}"
+        return parse_csv_queries(df)
+    
+    # Read just the header so pyarrow can skip every other column
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            wanted = [col for col in next(csv.reader(f)) if col in _CSV_COLUMNS]
+    except Exception:
+        wanted = None  # Let pyarrow report the problem below
+    
+    convert_options = None
+    if wanted is not None:
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=wanted, column_types={col: pa.string() for col in wanted})
+    
+    try:
+        table = pa_csv.read_csv(path, convert_options=convert_options)
+    except Exception as e:
+        return [], None, f"Error reading CSV file: {str(e)}"
+    
+    prompt_col = next((col for col in PROMPT_COLUMNS if col in table.column_names), None)
+    if not prompt_col:
+        return [], None, f"CSV must contain one of these columns: {', '.join(PROMPT_COLUMNS)}"
+    
+    if table.num_rows == 0:
+        return [], None, "CSV file is empty"
+    
+    def _trimmed(col: str) -> "pa.ChunkedArray":
+        column = pc.cast(table.column(col), pa.string())
+        return pc.utf8_trim_whitespace(pc.fill_null(column, ""))
+    
+    prompts = _trimmed(prompt_col)
+    prompt_mask = pc.greater(pc.utf8_length(prompts), 0)
+    if pc.sum(prompt_mask).as_py() in (None, 0):
+        return [], None, f"No valid prompts found in '{prompt_col}' column"
+    
+    queries = pc.filter(prompts, prompt_mask).to_pylist()
+    
+    reference_answers = None
+    reference_col = next((col for col in REFERENCE_COLUMNS if col in table.column_names), None)
+    if reference_col:
+        references = _trimmed(reference_col)
+        # An existing but empty references column means no references
+        if pc.any(pc.greater(pc.utf8_length(references), 0)).as_py():
+            reference_answers = pc.filter(references, prompt_mask).to_pylist()
+    
+    logger.info(f"Parsed {len(queries)} queries" + 
+                (f" with {len([r for r in reference_answers if r])} reference answers" if reference_answers else " (no references)"))
     
-    return True, has_references, None
+    return queries, reference_answers, None
 
-def parse_csv_queries(df: pd.DataFrame) -> Tuple[List[str], Optional[List[str]], Optional[str]]:
+def parse_csv_queries(df: Union[pd.DataFrame, str]) -> Tuple[List[str], Optional[List[str]], Optional[str]]:
     """Parse queries and optional reference answers from CSV DataFrame.
     
     Args:
-        df: Pandas DataFrame from CSV
+        df: Pandas DataFrame from CSV, or a path to the CSV file (parsed
+            with parse_csv_queries_fast)
         
     Returns:
         Tuple of (queries, reference_answers, error_message)
     """
-    has_prompts, has_references, error_msg = detect_csv_format(df)
+    if isinstance(df, (str, os.PathLike)):
+        return parse_csv_queries_fast(os.fspath(df))
+    
+    has_prompts, has_references, error_msg, prompt_col, reference_col = detect_csv_format(df)
     if error_msg:
         return [], None, error_msg
     
-    # Find prompt column
-    prompt_columns = ['prompt', 'query', 'question']
-    prompt_col = None
-    for col in prompt_columns:
-        if col in df.columns:
-            prompt_col = col
-            break
-    
-    # Extract queries
-    queries = df[prompt_col].dropna().str.strip().tolist()
-    queries = [q for q in queries if q]  # Remove empty strings
+    # One vectorized mask of non-empty prompts, shared by queries and references
+    prompts = df[prompt_col]
+    stripped_prompts = prompts.astype(str).str.strip()
+    mask = (prompts.notna() & stripped_prompts.astype(bool)).to_numpy()
+    queries = stripped_prompts.to_numpy()[mask].tolist()
     
     reference_answers = None
     if has_references:
-        # Find reference column
-        reference_columns = ['reference_answer', 'reference', 'ground_truth', 'answer']
-        reference_col = None
-        for col in reference_columns:
-            if col in df.columns:
-                reference_col = col
-                break
-        
-        if reference_col:
-            reference_answers = df[reference_col].fillna('').str.strip().tolist()
-            # Ensure reference_answers matches queries length
-            if len(reference_answers) != len(df):
-                # Pad or truncate to match DataFrame length, then filter to match queries
-                reference_answers = reference_answers[:len(df)]
-            
-            # Filter reference answers to match non-empty queries
-            filtered_refs = []
-            for i, query in enumerate(df[prompt_col]):
-                if pd.notna(query) and str(query).strip():
-                    ref_idx = min(i, len(reference_answers) - 1)
-                    filtered_refs.append(reference_answers[ref_idx] if ref_idx >= 0 else '')
-            reference_answers = filtered_refs
+        # Keep references aligned with the non-empty queries
+        references = df[reference_col].fillna('').astype(str).str.strip()
+        reference_answers = references.to_numpy()[mask].tolist()
     
     logger.info(f"Parsed {len(queries)} queries" + 
                 (f" with {len([r for r in reference_answers if r])} reference answers" if reference_answers else " (no references)"))
     
     return queries, reference_answers, None
 
+def _blank_positions(values: Sequence[Optional[str]]) -> List[int]:
+    """Indices of None, empty or whitespace-only strings, found with vectorized string kernels."""
+    if _PYARROW_AVAILABLE:
+        array = pc.fill_null(pa.array(values, type=pa.string()), "")
+        blank = pc.equal(pc.utf8_length(pc.utf8_trim_whitespace(array)), 0)
+        return np.flatnonzero(blank.to_numpy(zero_copy_only=False)).tolist()
+    
+    array = np.array(values, dtype=object)
+    array[np.equal(array, None)] = ""
+    return np.flatnonzero(np.char.str_len(np.char.strip(array.astype(str))) == 0).tolist()
+
 def validate_queries_and_references(queries: List[str], reference_answers: Optional[List[str]] = None) -> Tuple[bool, Optional[str]]:
     """Validate queries and reference answers.
     
@@ -141,24 +331,22 @@ def validate_queries_and_references(queries: List[str], reference_answers: Optio
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not queries:
+    n = len(queries) if queries is not None else 0
+    if n == 0:
         return False, "No queries provided"
     
-    if len(queries) == 0:
-        return False, "Query list is empty"
-    
     # Check for empty queries
-    empty_queries = [i for i, q in enumerate(queries) if not q or not q.strip()]
+    empty_queries = _blank_positions(queries)
     if empty_queries:
         return False, f"Empty queries found at positions: {empty_queries}"
     
     # Validate reference answers if provided
     if reference_answers is not None:
-        if len(reference_answers) != len(queries):
-            return False, f"Mismatch: {len(queries)} queries but {len(reference_answers)} reference answers"
+        if len(reference_answers) != n:
+            return False, f"Mismatch: {n} queries but {len(reference_answers)} reference answers"
         
         # Check for reference quality (warn but don't fail)
-        empty_refs = [i for i, ref in enumerate(reference_answers) if not ref or not ref.strip()]
+        empty_refs = _blank_positions(reference_answers)
         if empty_refs:
             logger.warning(f"Empty reference answers found at positions: {empty_refs} - these queries will use reference-free metrics only")
     
@@ -173,100 +361,74 @@ def setup_ragas(enable_reference_metrics: bool = False) -> Tuple[bool, List, Lis
     Returns:
         Tuple of (ragas_available, metrics, metric_names, error_message)
     """
-    try:
-        # Check if ragas is installed
-        import importlib.util
-        ragas_spec = importlib.util.find_spec("ragas")
-        if ragas_spec is None:
-            return False, [], [], "RAGAS package is not installed. Install with 'pip install ragas'"
+    # Copy the cached tuples so callers can't mutate the memoized result
+    ragas_available, metrics, metric_names, error_message = _setup_ragas_cached(enable_reference_metrics)
+    return ragas_available, list(metrics), list(metric_names), error_message
 
-        # Import RAGAS
-        import ragas
+@functools.lru_cache(maxsize=2)
+def _setup_ragas_cached(enable_reference_metrics: bool) -> Tuple[bool, tuple, tuple, Optional[str]]:
+    """Resolve RAGAS availability and metric classes once per mode."""
+    if not _RAGAS_AVAILABLE:
+        if isinstance(_RAGAS_IMPORT_ERROR, ModuleNotFoundError) and _RAGAS_IMPORT_ERROR.name == "ragas":
+            return False, (), (), "RAGAS package is not installed. Install with 'pip install ragas'"
+        logger.error(f"Error setting up RAGAS: {str(_RAGAS_IMPORT_ERROR)}")
+        return False, (), (), f"Error setting up RAGAS: {str(_RAGAS_IMPORT_ERROR)}"
 
-        # Log RAGAS version
-        ragas_version = ragas.__version__
-        logger.info(f"RAGAS version: {ragas_version}")
+    # Log RAGAS version
+    logger.info(f"RAGAS version: {ragas.__version__}")
 
-        # Import metrics using new v0.2 API
-        metrics = []
-        metric_names = []
+    # Metrics that work without reference data (v0.2 API)
+    metric_names = BASIC_METRICS
 
-        # Import metrics that work without reference data
-        try:
-            from ragas.metrics import Faithfulness
-            metrics.append(Faithfulness)
-            metric_names.append("faithfulness")
-        except ImportError:
-            logger.info("Faithfulness metric not available")
+    # Add reference-based metrics if enabled
+    if enable_reference_metrics:
+        logger.info("Adding reference-based metrics...")
+        metric_names += REFERENCE_METRICS
 
-        try:
-            from ragas.metrics import AnswerRelevancy
-            metrics.append(AnswerRelevancy)
-            metric_names.append("answer_relevancy")
-        except ImportError:
-            logger.info("AnswerRelevancy metric not available")
+    metrics = tuple(_METRIC_CLASSES[name] for name in metric_names)
+    return True, metrics, metric_names, None
 
-        # Use LLMContextPrecisionWithoutReference instead of standard ContextPrecision
-        try:
-            from ragas.metrics import LLMContextPrecisionWithoutReference
-            metrics.append(LLMContextPrecisionWithoutReference)
-            metric_names.append("context_precision_without_reference")
-        except ImportError:
-            logger.info("LLMContextPrecisionWithoutReference metric not available")
+_page_content = operator.itemgetter("page_content")
 
-        try:
-            from ragas.metrics import ContextRelevance
-            metrics.append(ContextRelevance)
-            metric_names.append("context_relevancy")
-        except ImportError:
-            logger.info("ContextRelevance metric not available")
-
-        # Add reference-based metrics if enabled
-        if enable_reference_metrics:
-            logger.info("Adding reference-based metrics...")
-            
-            try:
-                from ragas.metrics import AnswerSimilarity
-                metrics.append(AnswerSimilarity)
-                metric_names.append("answer_similarity")
-                logger.info("Added AnswerSimilarity metric")
-            except ImportError:
-                try:
-                    from ragas.metrics import SemanticSimilarity
-                    metrics.append(SemanticSimilarity)
-                    metric_names.append("answer_similarity")  # Keep same name for UI consistency
-                    logger.info("Added SemanticSimilarity metric as fallback for answer_similarity")
-                except ImportError:
-                    logger.info("Neither AnswerSimilarity nor SemanticSimilarity metric available")
-            
-            try:
-                from ragas.metrics import AnswerCorrectness
-                metrics.append(AnswerCorrectness)
-                metric_names.append("answer_correctness")
-                logger.info("Added AnswerCorrectness metric")
-            except ImportError:
-                logger.info("AnswerCorrectness metric not available")
-            
-            try:
-                from ragas.metrics import ContextPrecision
-                metrics.append(ContextPrecision)
-                metric_names.append("context_precision")
-                logger.info("Added ContextPrecision metric (standard version)")
-            except ImportError:
-                logger.info("ContextPrecision metric not available")
-            
-            try:
-                from ragas.metrics import ContextRecall
-                metrics.append(ContextRecall)
-                metric_names.append("context_recall")
-                logger.info("Added ContextRecall metric")
-            except ImportError:
-                logger.info("ContextRecall metric not available")
-
-        return True, metrics, metric_names, None
-    except Exception as e:
-        logger.error(f"Error setting up RAGAS: {str(e)}")
-        return False, [], [], f"Error setting up RAGAS: {str(e)}"
+def _build_ok_result(query: str, rag_result: Dict[str, Any], reference_answer: str) -> Dict[str, Any]:
+    """Build the result row for a successful RAG response."""
+    raw_contexts = rag_result.get("contexts", ())
+    try:
+        # Immutable, compact sequence built in a single C-level pass
+        contexts = tuple(map(_page_content, raw_contexts))
+    except TypeError:
+        # Plain-string contexts are passed through as-is
+        contexts = tuple(
+            item if isinstance(item, str) else item["page_content"]
+            for item in raw_contexts
+        )
+    return {
+        "query": query,
+        "ground_truths": [reference_answer] if reference_answer else [""],
+        "reference_answer": reference_answer,  # Store for easier access
+        "answer": rag_result["response"],
+        "contexts": contexts,
+        "response_time": rag_result.get("response_time", 0),
+        "kb_id": rag_result.get("kb_id"),
+        "chat_id": rag_result.get("chat_id"),
+    }
+
+def _build_err_result(query: str, rag_result: Dict[str, Any], reference_answer: str) -> Dict[str, Any]:
+    """Build the result row for a failed RAG response."""
+    return {
+        "query": query,
+        "answer": rag_result.get("response", ""),  # For RAGAS compatibility
+        "contexts": [],
+        "ground_truths": [reference_answer] if reference_answer else [""],
+        "reference_answer": reference_answer,
+        "error": rag_result.get("error", "Unknown error"),
+        "response_time": rag_result.get("response_time", 0)
+    }
+
+def _format_rag_result(query: str, rag_result: Dict[str, Any], reference_answer: str) -> Dict[str, Any]:
+    """Shape a raw RagChatUtil response into an evaluation result row."""
+    build = _build_err_result if "error" in rag_result else _build_ok_result
+    return build(query, rag_result, reference_answer)
 
 async def generate_rag_responses(
     queries: List[str], 
@@ -278,7 +440,12 @@ async def generate_rag_responses(
     progress_callback=None,
     use_batch_processing: bool = True,
     batch_size: int = 5,
-    max_concurrent: int = 3
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    use_cache: bool = False,
+    cache_ttl_seconds: Optional[int] = None,
+    similarity_threshold: Optional[float] = None,
+    cache_path: Optional[str] = None,
+    cache_tag: Optional[str] = None
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Generate RAG responses for a list of queries
     
@@ -290,202 +457,407 @@ async def generate_rag_responses(
         password: Password for API authentication
         reference_answers: Optional list of reference answers (must match queries length if provided)
         progress_callback: Optional callback function for progress updates
-        use_batch_processing: Enable batch processing for better performance
-        batch_size: Number of queries to process in each batch
-        max_concurrent: Maximum concurrent requests per batch
+        use_batch_processing: Unused; queries are always dispatched concurrently (kept for compatibility)
+        batch_size: Unused; kept for compatibility
+        max_concurrent: Maximum concurrent in-flight requests
+        use_cache: Reuse RAG responses stored by earlier runs for the same KB and query
+        cache_ttl_seconds: Ignore cached responses older than this (None keeps them forever)
+        similarity_threshold: Also reuse responses of near-duplicate cached queries whose
+            similarity is at least this value, e.g. 0.95 (None matches exact queries only)
+        cache_path: Response cache database file (defaults to RAG_EVAL_CACHE_PATH)
+        cache_tag: Only reuse responses stored under the same tag, e.g. the RAG model or
+            KB version (defaults to RAG_EVAL_CACHE_TAG)
         
     Returns:
         Tuple of (list of response dictionaries, logs)
     """
     monitor = get_monitor()
+    n = len(queries)
     
     with monitor.measure_operation("rag_responses_generation", 
-                                 query_count=len(queries), 
+                                 query_count=n, 
                                  kb_name=kb_name,
-                                 use_batch_processing=use_batch_processing,
-                                 batch_size=batch_size):
-        # Create chat utility
-        chat_util = RagChatUtil(
-            base_url=rag_api_url,
-            username=username,
-            password=password
-        )
-
-        # Enable instrumentation
-        chat_util.enable_instrumentation()
-
-        if use_batch_processing and len(queries) > 1:
-            logger.info(f"Using batch processing: {len(queries)} queries, batch_size={batch_size}, max_concurrent={max_concurrent}")
-            
-            # Use batch processing for better performance
-            with monitor.measure_operation("rag_batch_processing", 
-                                         query_count=len(queries)):
-                raw_results = await chat_util.generate_rag_responses_batch(
-                    queries, kb_name, batch_size=batch_size, max_concurrent=max_concurrent
-                )
-        else:
-            logger.info(f"Using sequential processing: {len(queries)} queries")
-            
-            # Fall back to sequential processing
-            raw_results = []
-            for i, query in enumerate(queries):
-                logger.info(f"Processing query {i+1}/{len(queries)}: {query[:50]}...")
-
-                with monitor.measure_operation("rag_api_single_query", 
-                                             query_index=i+1, 
-                                             query_preview=query[:50]):
-                    rag_result = await chat_util.generate_rag_response(query, kb_name)
-                
-                raw_results.append(rag_result)
-
-        # Process results and add reference answers
-        results = []
-        all_logs = chat_util.get_logs()
+                                 max_concurrent=max_concurrent):
+        results: List[Optional[Dict[str, Any]]] = [None] * n
         
-        for i, rag_result in enumerate(raw_results):
-            query = queries[i] if i < len(queries) else ""
-            
-            # Get reference answer for this query
+        def finish(i: int, rag_result: Dict[str, Any]) -> None:
+            """Format one query's response and report progress as soon as it is known."""
             reference_answer = ""
             if reference_answers and i < len(reference_answers):
                 reference_answer = reference_answers[i] or ""
-
-            # Format response
-            if "error" not in rag_result:
-                contexts = [item["page_content"] for item in rag_result.get("contexts", [])]
-                results.append({
-                    "query": query,
-                    "ground_truths": [reference_answer] if reference_answer else [""],
-                    "reference_answer": reference_answer,  # Store for easier access
-                    "answer": rag_result["response"],
-                    "contexts": contexts,
-                    "response_time": rag_result.get("response_time", 0),
-                    "kb_id": rag_result.get("kb_id"),
-                    "chat_id": rag_result.get("chat_id"),
-                })
-            else:
-                # Store error result
-                results.append({
-                    "query": query,
-                    "answer": rag_result.get("response", ""),  # For RAGAS compatibility
-                    "contexts": [],
-                    "ground_truths": [reference_answer] if reference_answer else [""],
-                    "reference_answer": reference_answer,
-                    "error": rag_result.get("error", "Unknown error"),
-                    "response_time": rag_result.get("response_time", 0)
-                })
+            results[i] = _format_rag_result(queries[i], rag_result, reference_answer)
+            if "error" in results[i]:
                 monitor.increment_counter("failed_operations")
-
-            # Update progress if callback is provided
             if progress_callback:
-                progress_callback(i, len(queries), query, results[-1])
+                progress_callback(i, n, queries[i], results[i])
+        
+        # Serve repeated queries from the persistent response cache
+        cache = ResponseCache(
+            path=cache_path or DEFAULT_CACHE_PATH,
+            ttl_seconds=cache_ttl_seconds,
+            tag=cache_tag if cache_tag is not None else DEFAULT_CACHE_TAG,
+        ) if use_cache else None
+        try:
+            all_logs = await _dispatch_rag_queries(
+                queries, kb_name, cache, similarity_threshold, finish,
+                rag_api_url, username, password, max_concurrent
+            )
+        finally:
+            if cache is not None:
+                cache.close()
 
     return results, all_logs
 
-def create_evaluation_llm(openai_model: str, api_key: str) -> Tuple[Any, Optional[str]]:
+async def _dispatch_rag_queries(
+    queries: List[str],
+    kb_name: str,
+    cache: Optional[ResponseCache],
+    similarity_threshold: Optional[float],
+    finish,
+    rag_api_url: str,
+    username: str,
+    password: str,
+    max_concurrent: int
+) -> List[Dict[str, Any]]:
+    """Answer queries from the response cache or the RAG API.
+    
+    finish(i, raw_response) is called for every query as soon as its response is
+    known; a query that raises gets an error response instead of aborting the rest.
+    
+    Returns:
+        The RAG API logs of the run
+    """
+    monitor = get_monitor()
+    n = len(queries)
+    raw_results: List[Optional[Dict[str, Any]]] = [None] * n
+    if cache is not None:
+        for i, query in enumerate(queries):
+            raw_results[i] = cache.get(kb_name, query)
+            if raw_results[i] is None and similarity_threshold is not None:
+                raw_results[i] = cache.get_similar(kb_name, query, similarity_threshold)
+    pending = [(i, query) for i, query in enumerate(queries) if raw_results[i] is None]
+    if cache is not None:
+        logger.info(f"Response cache: {n - len(pending)}/{n} hits")
+        for i, rag_result in enumerate(raw_results):
+            if rag_result is not None:
+                finish(i, rag_result)
+
+    # Dispatch each distinct query once; repeats reuse the first occurrence's response
+    first_index: Dict[str, int] = {}
+    indices_by_query: Dict[str, List[int]] = {}
+    for i, query in pending:
+        first_index.setdefault(query, i)
+        indices_by_query.setdefault(query, []).append(i)
+    unique_pending = [(i, query) for query, i in first_index.items()]
+    if len(unique_pending) < len(pending):
+        logger.info(f"Deduplicated queries: {len(unique_pending)} unique of {len(pending)} to send")
+
+    # Create chat utility, sizing the connection pool to the number of in-flight requests
+    chat_util = RagChatUtil(
+        base_url=rag_api_url,
+        username=username,
+        password=password,
+        max_connections=max(1, max_concurrent),
+        max_keepalive_connections=max(1, max_concurrent)
+    )
+
+    # Enable instrumentation
+    chat_util.enable_instrumentation()
+
+    if unique_pending:
+        # One pooled session (and one login) for every query in this run
+        async with chat_util:
+            logger.info(f"Using concurrent processing: {len(unique_pending)} queries, max_concurrent={max_concurrent}")
+            
+            # Requests overlap, capped by the semaphore
+            semaphore = asyncio.Semaphore(max(1, max_concurrent))
+            
+            # Resolve the knowledge base once instead of listing KBs for every query
+            kb = await chat_util.get_knowledge_base_by_name(kb_name)
+            if not kb:
+                # Every query would fail the same way; don't look the KB up again per query
+                logger.error(f"Knowledge base '{kb_name}' not found")
+                not_found = {
+                    "response": f"Error: Knowledge base '{kb_name}' not found",
+                    "contexts": [],
+                    "error": f"Knowledge base '{kb_name}' not found",
+                    "response_time": 0,
+                }
+                for i, query in pending:
+                    finish(i, {**not_found, "query": query})
+                return chat_util.drain_logs()
+            
+            async def process_query(i: int, query: str) -> Tuple[str, Dict[str, Any]]:
+                async with semaphore:
+                    logger.info(f"Processing query {i+1}/{n}: {query[:50]}...")
+                    start_time = time.perf_counter()
+                    try:
+                        with monitor.measure_operation("rag_api_single_query", 
+                                                     query_index=i+1, 
+                                                     query_preview=query[:50]):
+                            return query, await chat_util.generate_rag_response(query, kb_name, kb=kb)
+                    except Exception as e:
+                        # One failing query becomes an error row instead of aborting the run
+                        logger.error(f"Error processing query '{query}': {str(e)}")
+                        return query, {
+                            "query": query,
+                            "response": f"Error: {str(e)}",
+                            "contexts": [],
+                            "error": str(e),
+                            "response_time": time.perf_counter() - start_time,
+                        }
+            
+            tasks = [asyncio.ensure_future(process_query(i, query)) for i, query in unique_pending]
+            try:
+                # Consume responses as they land: each one is formatted, reported and
+                # cached right away instead of being buffered until the slowest finishes
+                for next_done in asyncio.as_completed(tasks):
+                    query, rag_result = await next_done
+                    for j in indices_by_query[query]:
+                        finish(j, rag_result)
+                    # Only successful, grounded responses are worth replaying in later runs
+                    # (streamed HTTP failures come back as "Error: ..." text without contexts)
+                    if cache is not None and "error" not in rag_result and rag_result.get("contexts"):
+                        cache.set(kb_name, query, rag_result)
+            finally:
+                for task in tasks:
+                    task.cancel()
+    else:
+        # Everything was cached, so never touch the network
+        await chat_util.aclose()
+    
+    return chat_util.drain_logs()
+
+@functools.lru_cache(maxsize=None)
+def _get_ragas_cache() -> Optional[Any]:
+    """Return the shared RAGAS disk cache, or None if disabled or unavailable."""
+    if not RAGAS_CACHE_DIR or DiskCacheBackend is None:
+        return None
+    try:
+        cache = DiskCacheBackend(cache_dir=RAGAS_CACHE_DIR)
+    except ImportError as e:
+        logger.warning(f"RAGAS response caching disabled: {str(e)}")
+        return None
+    logger.info(f"Caching evaluation LLM and embedding calls in {RAGAS_CACHE_DIR}")
+    return cache
+
+def create_evaluation_llm(openai_model: str, api_key: str,
+                          http_async_client: Optional[httpx.AsyncClient] = None) -> Tuple[Any, Optional[str]]:
     """Create LLM for RAGAS evaluation.
     
+    The returned LLM should only serve one RAGAS evaluate() call: its async HTTP
+    client is bound to the event loop that first uses it, and RAGAS runs every
+    evaluate() on a new loop (see _create_evaluation_models).
+    
     Args:
         openai_model: OpenAI model name
         api_key: OpenAI API key
+        http_async_client: Optional HTTP client for the OpenAI requests
+            (the OpenAI SDK creates its own if None)
         
     Returns:
         Tuple of (llm_instance, error_message)
     """
     try:
-        from langchain_openai import ChatOpenAI
-        from ragas.llms import LangchainLLMWrapper
-        
         # Create the base LangChain LLM
-        base_llm = ChatOpenAI(model=openai_model, api_key=api_key)
+        # Deterministic scoring with bounded output
+        base_llm = ChatOpenAI(
+            model=openai_model,
+            api_key=api_key,
+            temperature=0,
+            max_tokens=EVALUATION_LLM_MAX_TOKENS,
+            max_retries=5,
+            timeout=60,
+            http_async_client=http_async_client
+        )
         
-        # Wrap it for RAGAS compatibility
-        eval_llm = LangchainLLMWrapper(base_llm)
+        # Wrap it for RAGAS compatibility; identical prompts are served from the disk cache
+        eval_llm = LangchainLLMWrapper(base_llm, cache=_get_ragas_cache())
         
-        logger.info(f"Created and wrapped LLM: {openai_model}")
+        logger.debug("Created and wrapped LLM: %s", openai_model)
         return eval_llm, None
     except Exception as e:
         error_msg = f"Error creating LLM: {str(e)}"
         logger.error(error_msg)
         return None, error_msg
 
-def prepare_evaluation_data(evaluation_data: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, bool, Optional[str]]:
-    """Prepare and validate evaluation data.
+def create_evaluation_embeddings(api_key: str,
+                                 http_async_client: Optional[httpx.AsyncClient] = None) -> Tuple[Any, Optional[str]]:
+    """Create embeddings for RAGAS metrics that compare texts semantically.
+    
+    Like create_evaluation_llm, the result should only serve one evaluate() call.
     
     Args:
-        evaluation_data: List of evaluation dictionaries
+        api_key: OpenAI API key
+        http_async_client: Optional HTTP client for the OpenAI requests
+            (the OpenAI SDK creates its own if None)
         
     Returns:
-        Tuple of (dataframe, has_contexts, error_message)
+        Tuple of (embeddings_instance, error_message)
     """
     try:
-        # Convert data to DataFrame
-        eval_df = pd.DataFrame(evaluation_data)
-        logger.info(f"Created DataFrame with {len(eval_df)} rows")
-        
-        # Rename columns to match expected format
-        column_mapping = {
-            'query': 'user_input',
-            'answer': 'response', 
-            'contexts': 'retrieved_contexts'
-        }
-        
-        for old_col, new_col in column_mapping.items():
-            if old_col in eval_df.columns:
-                eval_df = eval_df.rename(columns={old_col: new_col})
-                logger.info(f"Renamed column '{old_col}' to '{new_col}'")
+        eval_embeddings = LangchainEmbeddingsWrapper(
+            OpenAIEmbeddings(api_key=api_key, http_async_client=http_async_client),
+            cache=_get_ragas_cache()
+        )
         
-        # Add 'reference' column for reference-based metrics from reference_answer or ground_truths
-        if 'reference_answer' in eval_df.columns:
-            eval_df['reference'] = eval_df['reference_answer']
-            logger.info("Added 'reference' column from 'reference_answer'")
-        elif 'ground_truths' in eval_df.columns:
-            # Extract first ground truth as reference
-            eval_df['reference'] = eval_df['ground_truths'].apply(
-                lambda x: x[0] if isinstance(x, list) and len(x) > 0 else x if x else ""
-            )
-            logger.info("Added 'reference' column from first ground truth")
+        logger.debug("Created and wrapped OpenAI embeddings")
+        return eval_embeddings, None
+    except Exception as e:
+        error_msg = f"Error creating embeddings: {str(e)}"
+        logger.error(error_msg)
+        return None, error_msg
+
+def _create_evaluation_models(openai_model: str, api_key: str) -> Tuple[Any, Any]:
+    """Build the evaluation LLM and embeddings for one RAGAS evaluate() call.
+    
+    RAGAS runs every evaluate() on a fresh event loop (in a worker thread when
+    chunks are scored concurrently), and the async HTTP clients inside ChatOpenAI
+    and OpenAIEmbeddings stay bound to the loop that first used them. Only the
+    model settings are kept between calls; the clients are rebuilt each time,
+    which is cheap next to the requests they make. Identical prompts are still
+    served from the shared disk cache.
+    
+    Both share one connection pool with a keep-alive connection for every
+    concurrent RAGAS job, so requests within the call reuse their TCP/TLS
+    handshakes instead of each client opening its own connections.
+    
+    Raises:
+        RuntimeError: If the LLM cannot be created
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=RAGAS_MAX_WORKERS, max_keepalive_connections=RAGAS_MAX_WORKERS),
+        timeout=httpx.Timeout(60.0),
+    )
+    eval_llm, error_msg = create_evaluation_llm(openai_model, api_key, http_client)
+    if error_msg:
+        raise RuntimeError(error_msg)
+    # RAGAS falls back to its own default embeddings if these can't be created
+    eval_embeddings, _ = create_evaluation_embeddings(api_key, http_client)
+    return eval_llm, eval_embeddings
+
+def _ragas_run_config() -> "RunConfig":
+    """Executor settings shared by every RAGAS evaluate() call."""
+    return RunConfig(max_workers=RAGAS_MAX_WORKERS, max_wait=60)
+
+def prepare_evaluation_data(evaluation_data: List[Dict[str, Any]]) -> Tuple[Optional[List[Dict[str, Any]]], bool, Optional[str]]:
+    """Prepare and validate evaluation data.
+    
+    Args:
+        evaluation_data: List of evaluation dictionaries
         
+    Returns:
+        Tuple of (samples in RAGAS single-turn format, has_contexts, error_message)
+    """
+    try:
         # Check if we have any data to evaluate
-        if eval_df.empty:
+        if not evaluation_data:
             return None, False, "No evaluation data available"
         
+        # Map our keys onto RAGAS sample fields directly; no DataFrame is needed
+        # just to rename columns (query -> user_input, answer -> response,
+        # contexts -> retrieved_contexts, reference_answer/ground_truths -> reference)
+        samples = []
+        for item in evaluation_data:
+            if "reference_answer" in item:
+                reference = item["reference_answer"] or ""
+            elif "ground_truths" in item:
+                ground_truths = item["ground_truths"]
+                reference = ground_truths[0] if isinstance(ground_truths, list) and ground_truths else ground_truths or ""
+            else:
+                reference = None
+            samples.append({
+                "user_input": item.get("query", ""),
+                "response": item.get("answer", ""),
+                "retrieved_contexts": list(item.get("contexts") or ()),
+                "reference": reference,
+            })
+        logger.info(f"Prepared {len(samples)} evaluation samples")
+        
         # Check for contexts
-        has_contexts = False
-        if 'retrieved_contexts' in eval_df.columns:
-            context_counts = eval_df['retrieved_contexts'].apply(lambda x: len(x) if x else 0)
-            has_contexts = (context_counts > 0).any()
-            total_contexts = context_counts.sum()
-            rows_with_contexts = (context_counts > 0).sum()
-            
-            logger.info(f"Context analysis: {rows_with_contexts}/{len(eval_df)} rows have contexts, total contexts: {total_contexts}")
-            
-            if not has_contexts:
-                logger.warning("No retrieved contexts found in any rows - context-based metrics will be skipped")
-        else:
-            logger.warning("No 'retrieved_contexts' column found")
+        context_counts = np.fromiter(
+            (len(sample["retrieved_contexts"]) for sample in samples),
+            dtype=np.int32,
+            count=len(samples),
+        )
+        rows_with_contexts = int(np.count_nonzero(context_counts))
+        has_contexts = rows_with_contexts > 0
+        
+        logger.info(f"Context analysis: {rows_with_contexts}/{len(samples)} rows have contexts, total contexts: {int(context_counts.sum())}")
+        
+        if not has_contexts:
+            logger.warning("No retrieved contexts found in any rows - context-based metrics will be skipped")
         
         # Debug info
-        logger.info(f"DataFrame columns: {eval_df.columns.tolist()}")
-        if 'reference' in eval_df.columns:
-            non_empty_refs = eval_df['reference'].apply(lambda x: bool(str(x).strip())).sum()
-            logger.info(f"Reference column analysis: {non_empty_refs}/{len(eval_df)} rows have non-empty references")
+        non_empty_refs = len(samples) - len(_blank_positions([sample["reference"] for sample in samples]))
+        logger.info(f"Reference analysis: {non_empty_refs}/{len(samples)} samples have non-empty references")
         
-        if len(eval_df) > 0:
-            sample_row = eval_df.iloc[0].to_dict()
+        if logger.isEnabledFor(logging.INFO):
+            sample_row = dict(samples[0])
             # Truncate long values for logging
             for key, value in sample_row.items():
                 if isinstance(value, str) and len(value) > 100:
                     sample_row[key] = value[:100] + "..."
-            logger.info(f"Sample row: {sample_row}")
+            logger.info("Sample row: %s", sample_row)
         
-        return eval_df, has_contexts, None
+        return samples, has_contexts, None
         
     except Exception as e:
         error_msg = f"Error preparing evaluation data: {str(e)}"
         logger.error(error_msg)
         return None, False, error_msg
 
+def evaluate_all_metrics(eval_dataset, eval_llm, metric_names: Sequence[str],
+                         eval_embeddings=None) -> Dict[str, List[float]]:
+    """Score several RAGAS metrics with one fused evaluate() call.
+    
+    RAGAS schedules every metric x sample job of the call on one executor, so
+    the dataset is traversed once instead of once per metric. The result of
+    the most recent call is kept, so asking again for the same dataset, LLM
+    and metrics (e.g. through the per-metric wrappers) reuses it.
+    
+    Args:
+        eval_dataset: EvaluationDataset instance
+        eval_llm: LLM instance for evaluation
+        metric_names: Metrics to evaluate (see BASIC_METRICS and REFERENCE_METRICS)
+        eval_embeddings: Optional embeddings instance (RAGAS default if None)
+        
+    Returns:
+        Dictionary mapping each successfully evaluated metric to its per-sample scores
+    """
+    global _LAST_FUSED_EVALUATION
+    metric_names = tuple(metric_names)
+    
+    with _MEMO_LOCK:
+        cached = _LAST_FUSED_EVALUATION
+    if cached is not None:
+        cached_dataset, cached_llm, cached_metrics, cached_results = cached
+        if cached_dataset is eval_dataset and cached_llm is eval_llm and cached_metrics == metric_names:
+            return cached_results
+    
+    monitor = get_monitor()
+    with monitor.measure_operation("ragas_eval_all_metrics",
+                                 dataset_size=len(eval_dataset),
+                                 metric_count=len(metric_names)):
+        results, errors = _evaluate_unified_metrics_batch(
+            eval_dataset, eval_llm, list(metric_names), eval_embeddings
+        )
+    for error in errors:
+        logger.warning(error)
+    
+    with _MEMO_LOCK:
+        _LAST_FUSED_EVALUATION = (eval_dataset, eval_llm, metric_names, results)
+    return results
+
+def _evaluate_basic_metric(eval_dataset, eval_llm, metric: str,
+                           eval_embeddings=None) -> Tuple[Optional[Any], Optional[str]]:
+    """Return one basic metric's scores from the fused evaluation of all of them."""
+    results = evaluate_all_metrics(eval_dataset, eval_llm, BASIC_METRICS, eval_embeddings)
+    scores = results.get(metric)
+    if scores is None:
+        return None, f"No {metric} result found"
+    return scores, None
+
 def evaluate_faithfulness(eval_dataset, eval_llm) -> Tuple[Optional[Any], Optional[str]]:
     """Evaluate faithfulness metric.
     
@@ -496,111 +868,20 @@ def evaluate_faithfulness(eval_dataset, eval_llm) -> Tuple[Optional[Any], Option
     Returns:
         Tuple of (metric_result, error_message)
     """
-    monitor = get_monitor()
-    
-    with monitor.measure_operation("ragas_eval_faithfulness", dataset_size=len(eval_dataset)):
-        try:
-            from ragas.metrics import Faithfulness
-            from ragas import evaluate
-            
-            logger.info("Initializing faithfulness metric...")
-            faithfulness_metric = Faithfulness(llm=eval_llm)
-            logger.info("Successfully initialized faithfulness metric")
-            
-            logger.info("Running faithfulness evaluation...")
-            monitor.increment_counter("openai_api_calls")  # This will make multiple API calls
-            result = evaluate(
-                dataset=eval_dataset,
-                metrics=[faithfulness_metric]
-            )
-            
-            # Debug: log what we actually got back
-            logger.info(f"RAGAS result type: {type(result).__name__}")
-            logger.info(f"RAGAS result attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
-            logger.info(f"RAGAS scores: {result.scores if hasattr(result, 'scores') else 'No scores attr'}")
-            
-            # Try accessing through scores attribute first (correct for RAGAS 0.2.x)
-            if hasattr(result, 'scores') and isinstance(result.scores, list) and len(result.scores) > 0:
-                # Extract faithfulness scores from list of dicts
-                faithfulness_scores = [score_dict.get('faithfulness') for score_dict in result.scores if 'faithfulness' in score_dict]
-                if faithfulness_scores:
-                    logger.info(f"Faithfulness evaluation completed via scores: {len(faithfulness_scores)} scores")
-                    return faithfulness_scores, None
-            elif hasattr(result, 'faithfulness'):
-                faithfulness_scores = result.faithfulness
-                logger.info(f"Faithfulness evaluation completed: {type(faithfulness_scores).__name__}")
-                return faithfulness_scores.tolist() if hasattr(faithfulness_scores, 'tolist') else faithfulness_scores, None
-            else:
-                logger.warning("No faithfulness result found in evaluation output")
-                # Try to log what's actually in the result
-                if hasattr(result, '__dict__'):
-                    logger.info(f"Result dict keys: {list(result.__dict__.keys())}")
-                if hasattr(result, 'scores') and hasattr(result.scores, '__dict__'):
-                    logger.info(f"Scores dict keys: {list(result.scores.__dict__.keys())}")
-                return None, "No faithfulness result found"
-                
-        except Exception as e:
-            error_msg = f"Faithfulness evaluation error: {str(e)}"
-            logger.error(error_msg)
-            import traceback
-            logger.error(traceback.format_exc())
-            return None, error_msg
+    return _evaluate_basic_metric(eval_dataset, eval_llm, "faithfulness")
 
-def evaluate_answer_relevancy(eval_dataset, eval_llm) -> Tuple[Optional[Any], Optional[str]]:
+def evaluate_answer_relevancy(eval_dataset, eval_llm, eval_embeddings=None) -> Tuple[Optional[Any], Optional[str]]:
     """Evaluate answer relevancy metric.
     
     Args:
         eval_dataset: EvaluationDataset instance
         eval_llm: LLM instance for evaluation
+        eval_embeddings: Optional embeddings instance (RAGAS default if None)
         
     Returns:
         Tuple of (metric_result, error_message)
     """
-    try:
-        from ragas.metrics import AnswerRelevancy
-        from ragas import evaluate
-        
-        logger.info("Initializing answer relevancy metric...")
-        answer_relevancy_metric = AnswerRelevancy(llm=eval_llm)
-        logger.info("Successfully initialized answer relevancy metric")
-        
-        logger.info("Running answer relevancy evaluation...")
-        result = evaluate(
-            dataset=eval_dataset,
-            metrics=[answer_relevancy_metric]
-        )
-        
-        # Debug: log what we actually got back
-        logger.info(f"RAGAS result type: {type(result).__name__}")
-        logger.info(f"RAGAS result attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
-        logger.info(f"RAGAS scores: {result.scores if hasattr(result, 'scores') else 'No scores attr'}")
-        
-        # Try accessing through scores attribute first (correct for RAGAS 0.2.x)
-        if hasattr(result, 'scores') and isinstance(result.scores, list) and len(result.scores) > 0:
-            # Extract answer_relevancy scores from list of dicts
-            relevancy_scores = [score_dict.get('answer_relevancy') for score_dict in result.scores if 'answer_relevancy' in score_dict]
-            if relevancy_scores:
-                logger.info(f"Answer relevancy evaluation completed via scores: {len(relevancy_scores)} scores")
-                return relevancy_scores, None
-        elif hasattr(result, 'answer_relevancy'):
-            relevancy_scores = result.answer_relevancy
-            logger.info(f"Answer relevancy evaluation completed: {type(relevancy_scores).__name__}")
-            return relevancy_scores.tolist() if hasattr(relevancy_scores, 'tolist') else relevancy_scores, None
-        else:
-            logger.warning("No answer_relevancy result found in evaluation output")
-            # Try to log what's actually in the result
-            if hasattr(result, '__dict__'):
-                logger.info(f"Result dict keys: {list(result.__dict__.keys())}")
-            if hasattr(result, 'scores') and hasattr(result.scores, '__dict__'):
-                logger.info(f"Scores dict keys: {list(result.scores.__dict__.keys())}")
-            return None, "No answer_relevancy result found"
-            
-    except Exception as e:
-        error_msg = f"Answer relevancy evaluation error: {str(e)}"
-        logger.error(error_msg)
-        import traceback
-        logger.error(traceback.format_exc())
-        return None, error_msg
+    return _evaluate_basic_metric(eval_dataset, eval_llm, "answer_relevancy", eval_embeddings)
 
 def evaluate_context_precision(eval_dataset, eval_llm) -> Tuple[Optional[Any], Optional[str]]:
     """Evaluate context precision metric (without reference).
@@ -612,66 +893,7 @@ def evaluate_context_precision(eval_dataset, eval_llm) -> Tuple[Optional[Any], O
     Returns:
         Tuple of (metric_result, error_message)
     """
-    try:
-        from ragas.metrics import LLMContextPrecisionWithoutReference
-        from ragas import evaluate
-        
-        logger.info("Initializing context precision metric...")
-        context_precision_metric = LLMContextPrecisionWithoutReference(llm=eval_llm)
-        logger.info("Successfully initialized context precision metric")
-        
-        logger.info("Running context precision evaluation...")
-        result = evaluate(
-            dataset=eval_dataset,
-            metrics=[context_precision_metric]
-        )
-        
-        # Debug: Check what attributes are available
-        logger.info(f"RAGAS result type: {type(result).__name__}")
-        logger.info(f"RAGAS result attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
-        
-        # Try different possible attribute names for context precision
-        possible_attrs = ['context_precision_without_reference', 'context_precision', 'contextprecision', 'llm_context_precision_without_reference']
-        precision_scores = None
-        
-        for attr in possible_attrs:
-            if hasattr(result, attr):
-                precision_scores = getattr(result, attr)
-                logger.info(f"Found context precision result under attribute: {attr}")
-                break
-        
-        if precision_scores is not None:
-            logger.info(f"Context precision evaluation completed: {type(precision_scores).__name__}")
-            return precision_scores.tolist() if hasattr(precision_scores, 'tolist') else precision_scores, None
-        else:
-            # Try to get from scores like other metrics
-            if hasattr(result, 'scores') and result.scores:
-                logger.info(f"RAGAS scores: {result.scores}")
-                # Find the correct key for context precision
-                precision_key = None
-                for score_dict in result.scores:
-                    for key in score_dict:
-                        if 'precision' in key.lower() and 'context' in key.lower():
-                            precision_key = key
-                            logger.info(f"Found context precision in scores under key: {key}")
-                            break
-                    if precision_key:
-                        break
-                
-                if precision_key:
-                    # Extract scores from all queries
-                    precision_scores = [score_dict.get(precision_key) for score_dict in result.scores if precision_key in score_dict]
-                    return precision_scores, None
-            
-            logger.warning("No context_precision_without_reference result found in evaluation output")
-            return None, "No context_precision_without_reference result found"
-            
-    except Exception as e:
-        error_msg = f"Context precision evaluation error: {str(e)}"
-        logger.error(error_msg)
-        import traceback
-        logger.error(traceback.format_exc())
-        return None, error_msg
+    return _evaluate_basic_metric(eval_dataset, eval_llm, "context_precision_without_reference")
 
 def evaluate_context_relevancy(eval_dataset, eval_llm) -> Tuple[Optional[Any], Optional[str]]:
     """Evaluate context relevancy metric.
@@ -683,173 +905,254 @@ def evaluate_context_relevancy(eval_dataset, eval_llm) -> Tuple[Optional[Any], O
     Returns:
         Tuple of (metric_result, error_message)
     """
-    try:
-        from ragas.metrics import ContextRelevance
-        from ragas import evaluate
-        
-        logger.info("Initializing context relevancy metric...")
-        context_relevancy_metric = ContextRelevance(llm=eval_llm)
-        logger.info("Successfully initialized context relevancy metric")
-        
-        logger.info("Running context relevancy evaluation...")
-        result = evaluate(
-            dataset=eval_dataset,
-            metrics=[context_relevancy_metric]
-        )
-        
-        # Debug: Check what attributes are available
-        logger.info(f"RAGAS result type: {type(result).__name__}")
-        logger.info(f"RAGAS result attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
-        
-        # Try different possible attribute names for context relevancy
-        possible_attrs = ['context_relevancy', 'context_relevance', 'contextrelevancy', 'contextrelevance']
-        relevancy_scores = None
-        
-        for attr in possible_attrs:
-            if hasattr(result, attr):
-                relevancy_scores = getattr(result, attr)
-                logger.info(f"Found context relevancy result under attribute: {attr}")
-                break
+    return _evaluate_basic_metric(eval_dataset, eval_llm, "context_relevancy")
+
+def _filter_available_metrics(target_metrics: List[str], has_contexts: bool,
+                              has_references: bool) -> Tuple[List[str], List[str]]:
+    """Split target metrics into those the data supports and errors for the rest."""
+    errors = []
+    available_metrics = []
+    
+    for metric in target_metrics:
+        requirements = _METRIC_REQUIREMENTS.get(metric)
+        if requirements is None:
+            continue
         
-        if relevancy_scores is not None:
-            logger.info(f"Context relevancy evaluation completed: {type(relevancy_scores).__name__}")
-            return relevancy_scores.tolist() if hasattr(relevancy_scores, 'tolist') else relevancy_scores, None
+        # Check data requirements for each metric
+        needs_contexts, needs_references = requirements
+        missing_contexts = needs_contexts and not has_contexts
+        missing_references = needs_references and not has_references
+        if not (missing_contexts or missing_references):
+            available_metrics.append(metric)
+        elif not needs_references:
+            errors.append(f"{metric}: No contexts available")
+        elif not needs_contexts:
+            errors.append(f"{metric}: No reference answers available")
         else:
-            # Try to get from scores like other metrics
-            if hasattr(result, 'scores') and result.scores:
-                logger.info(f"RAGAS scores: {result.scores}")
-                # Find the correct key for context relevancy
-                relevancy_key = None
-                for score_dict in result.scores:
-                    for key in score_dict:
-                        if 'context_relevance' in key.lower() or 'relevancy' in key.lower():
-                            relevancy_key = key
-                            logger.info(f"Found context relevancy in scores under key: {key}")
-                            break
-                    if relevancy_key:
-                        break
-                
-                if relevancy_key:
-                    # Extract scores from all queries
-                    relevancy_scores = [score_dict.get(relevancy_key) for score_dict in result.scores if relevancy_key in score_dict]
-                    return relevancy_scores, None
-            
-            logger.warning("No context_relevancy result found in evaluation output")
-            return None, "No context_relevancy result found"
-            
+            missing = []
+            if missing_contexts:
+                missing.append("contexts")
+            if missing_references:
+                missing.append("references")
+            errors.append(f"{metric}: Missing {', '.join(missing)}")
+    
+    return available_metrics, errors
+
+def _sample_hash(sample: Dict[str, Any], openai_model: str) -> str:
+    """Stable checkpoint key for a sample's scores under a given evaluation model."""
+    payload = json.dumps([openai_model, sample], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _is_score(value: Any) -> bool:
+    """True for a computed score, False for missing or NaN ones."""
+    return value is not None and not (isinstance(value, float) and math.isnan(value))
+
+def _load_checkpoint(checkpoint_path: Optional[str]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Read checkpointed per-sample scores keyed by sample hash (later rows win)."""
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return {}
+    try:
+        checkpoint_df = pd.read_csv(checkpoint_path)
     except Exception as e:
-        error_msg = f"Context relevancy evaluation error: {str(e)}"
-        logger.error(error_msg)
-        import traceback
-        logger.error(traceback.format_exc())
-        return None, error_msg
+        logger.warning(f"Ignoring unreadable RAGAS checkpoint {checkpoint_path}: {str(e)}")
+        return {}
+    
+    checkpoint = {}
+    for row in checkpoint_df.to_dict(orient="records"):
+        sample_hash = row.pop("sample_hash")
+        checkpoint[sample_hash] = {metric: None if pd.isna(value) else float(value) for metric, value in row.items()}
+    return checkpoint
+
+def _append_checkpoint(checkpoint_path: Optional[str], rows: List[Dict[str, Any]]) -> None:
+    """Append per-sample scores to the checkpoint CSV, writing the header once."""
+    if not checkpoint_path or not rows:
+        return
+    # Chunks scored in parallel threads must not interleave rows or both write the header
+    with _CHECKPOINT_LOCK:
+        pd.DataFrame(rows, columns=_CHECKPOINT_COLUMNS).to_csv(
+            checkpoint_path, mode="a", header=not os.path.exists(checkpoint_path), index=False
+        )
 
-def evaluate_metrics_batch(eval_dataset, eval_llm, target_metrics: List[str], 
-                          has_contexts: bool, has_references: bool) -> Tuple[Dict[str, Any], List[str], List[str]]:
-    """Evaluate multiple RAGAS metrics in batches for better performance.
+def evaluate_metrics_in_batches(eval_dataset, samples: List[Dict[str, Any]], eval_llm,
+                                target_metrics: List[str], has_contexts: bool, has_references: bool,
+                                openai_model: str, batch_size: int = 10,
+                                checkpoint_path: Optional[str] = None,
+                                eval_embeddings=None,
+                                model_factory=None) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """Evaluate RAGAS metrics batch by batch so a failure only loses one batch.
+    
+    With a checkpoint_path, per-sample scores are appended to a CSV after each
+    batch and samples that already have complete scores are skipped on re-runs.
+    Identical samples (same query, answer, contexts and reference) are scored
+    once and share the result. Only the metrics a sample still lacks are
+    evaluated for it, and cells left missing or NaN get one recovery pass; any
+    still unscored after that are None and reported per sample in errors.
     
     Args:
-        eval_dataset: EvaluationDataset instance
+        eval_dataset: EvaluationDataset instance built from samples
+        samples: Sample dictionaries backing eval_dataset (used for checkpoint keys)
         eval_llm: LLM instance for evaluation
         target_metrics: List of metrics to evaluate
         has_contexts: Whether dataset has retrieved contexts
         has_references: Whether dataset has reference answers
+        openai_model: Evaluation model name, part of the checkpoint key
+        batch_size: Number of samples per RAGAS evaluate() call
+        checkpoint_path: Optional CSV file for resumable evaluation
+        eval_embeddings: Optional embeddings instance (RAGAS default if None)
+        model_factory: Optional callable returning a fresh (eval_llm, eval_embeddings)
+            pair; called for every evaluate() instead of reusing eval_llm/eval_embeddings
         
     Returns:
         Tuple of (results_dict, successful_metrics, errors)
     """
     monitor = get_monitor()
-    results = {}
-    successful_metrics = []
-    errors = []
     
     # Filter out metrics that can't be evaluated due to missing data
-    available_metrics = []
+    available_metrics, errors = _filter_available_metrics(target_metrics, has_contexts, has_references)
+    if not available_metrics:
+        logger.warning("No metrics available for evaluation due to missing data requirements")
+        return {}, [], errors
     
-    for metric in target_metrics:
-        # Check data requirements for each metric
-        if metric in ['faithfulness', 'answer_relevancy']:
-            # These only need question + answer (always available)
-            available_metrics.append(metric)
-        elif metric in ['context_precision_without_reference', 'context_relevancy']:
-            # These need contexts (always available in RAG)
-            if has_contexts:
-                available_metrics.append(metric)
-            else:
-                errors.append(f"{metric}: No contexts available")
-        elif metric in ['answer_similarity', 'answer_correctness']:
-            # These need reference answers
-            if has_references:
-                available_metrics.append(metric)
-            else:
-                errors.append(f"{metric}: No reference answers available")
-        elif metric in ['context_precision', 'context_recall']:
-            # These need both contexts and references
-            if has_contexts and has_references:
-                available_metrics.append(metric)
-            else:
-                missing = []
-                if not has_contexts:
-                    missing.append("contexts")
-                if not has_references:
-                    missing.append("references")
-                errors.append(f"{metric}: Missing {', '.join(missing)}")
-    
-    # Single unified batch evaluation for all available metrics
-    if available_metrics:
-        with monitor.measure_operation("batch_eval_unified_metrics",
-                                     metrics=available_metrics,
-                                     metric_count=len(available_metrics)):
-            logger.info(f"Unified batch evaluation: {len(available_metrics)} metrics - {available_metrics}")
-            batch_results, batch_errors = _evaluate_unified_metrics_batch(eval_dataset, eval_llm, available_metrics)
-            results.update(batch_results)
-            successful_metrics.extend(batch_results.keys())
+    hashes = [_sample_hash(sample, openai_model) for sample in samples]
+    # First occurrence of each distinct sample; later duplicates copy its scores
+    first_index: Dict[str, int] = {}
+    for i, sample_hash in enumerate(hashes):
+        first_index.setdefault(sample_hash, i)
+    checkpoint = _load_checkpoint(checkpoint_path)
+    scores = [dict(checkpoint.get(sample_hash, {})) for sample_hash in hashes]
+    
+    def missing_metrics(i: int) -> Tuple[str, ...]:
+        return tuple(metric for metric in available_metrics if not _is_score(scores[i].get(metric)))
+    
+    step = max(1, batch_size)
+    
+    def run_batches(indices: List[int], metrics: List[str], label: str) -> None:
+        for start in range(0, len(indices), step):
+            batch_indices = indices[start:start + step]
+            logger.info(f"{label}: samples {start + 1}-{start + len(batch_indices)} of {len(indices)}")
+            with monitor.measure_operation("batch_eval_unified_metrics",
+                                         metrics=metrics,
+                                         metric_count=len(metrics),
+                                         sample_count=len(batch_indices)):
+                batch_dataset = EvaluationDataset(samples=[eval_dataset.samples[i] for i in batch_indices])
+                batch_llm, batch_embeddings = model_factory() if model_factory else (eval_llm, eval_embeddings)
+                batch_results, batch_errors = _evaluate_unified_metrics_batch(batch_dataset, batch_llm, metrics, batch_embeddings)
             errors.extend(batch_errors)
-    else:
-        logger.warning("No metrics available for evaluation due to missing data requirements")
+            
+            # Only score lists that line up with the batch can be attributed to samples
+            aligned = {metric: values for metric, values in batch_results.items() if len(values) == len(batch_indices)}
+            rows = []
+            for pos, i in enumerate(batch_indices):
+                for metric, values in aligned.items():
+                    scores[i][metric] = values[pos]
+                rows.append({"sample_hash": hashes[i], **{metric: scores[i].get(metric) for metric in available_metrics}})
+            _append_checkpoint(checkpoint_path, rows)
+    
+    def run_missing(indices: List[int], label: str) -> None:
+        # Group samples by the metrics they still lack, so scored cells are never recomputed
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i in indices:
+            missing = missing_metrics(i)
+            if missing:
+                groups.setdefault(missing, []).append(i)
+        for metrics, group in groups.items():
+            run_batches(group, list(metrics), label)
+    
+    pending = [i for i in first_index.values() if missing_metrics(i)]
+    if checkpoint_path:
+        logger.info(f"RAGAS checkpoint {checkpoint_path}: {len(first_index) - len(pending)}/{len(first_index)} distinct samples already scored")
+    if len(first_index) < len(samples):
+        logger.info(f"Scoring {len(first_index)} distinct samples for {len(samples)} rows")
+    run_missing(pending, "RAGAS batch")
+    
+    # Recovery pass for the cells RAGAS returned NaN or nothing for
+    retry = [i for i in pending if missing_metrics(i)]
+    if retry:
+        logger.info(f"Re-evaluating missing or NaN scores of {len(retry)} samples")
+        run_missing(retry, "RAGAS recovery batch")
+    
+    for i, sample_hash in enumerate(hashes):
+        if first_index[sample_hash] != i:
+            scores[i] = dict(scores[first_index[sample_hash]])
+    
+    # Cells that could not be scored stay None (averages and CSV exports skip them);
+    # a metric is only reported as failed when no sample got a score at all
+    results = {}
+    successful_metrics = []
+    for metric in available_metrics:
+        values = [sample_scores.get(metric) if _is_score(sample_scores.get(metric)) else None
+                  for sample_scores in scores]
+        failed = [i for i, value in enumerate(values) if value is None]
+        if len(failed) == len(values):
+            errors.append(f"{metric}: no valid scores")
+            logger.warning(f"No valid scores for {metric}")
+            continue
+        for i in failed:
+            errors.append(f"{metric}: no valid score for sample {i + 1} ('{samples[i].get('user_input', '')[:50]}')")
+        if failed:
+            logger.warning(f"{metric}: no valid score for {len(failed)} of {len(values)} samples")
+        results[metric] = values
+        successful_metrics.append(metric)
     
     return results, successful_metrics, errors
 
-def _evaluate_unified_metrics_batch(eval_dataset, eval_llm, metrics: List[str]) -> Tuple[Dict[str, Any], List[str]]:
-    """Unified batch evaluation for all RAGAS metrics in a single call."""
+def _extract_scores(result: Any, metric_key: str) -> Optional[List[float]]:
+    """Pull one metric's per-sample scores out of a RAGAS evaluation result.
+    
+    RAGAS 0.2.x exposes a list of per-sample score dicts as result.scores
+    and already transposes it into per-metric columns, served by result[key];
+    older results expose each metric as an attribute instead.
+    """
+    scores = getattr(result, "scores", None)
+    if isinstance(scores, list) and scores:
+        try:
+            # Column built once by EvaluationResult, no per-row dict scan
+            return result[metric_key] or None
+        except (KeyError, TypeError):
+            return [score_dict[metric_key] for score_dict in scores if metric_key in score_dict] or None
+    
+    metric_result = getattr(result, metric_key, None)
+    if metric_result is None:
+        return None
+    return metric_result.tolist() if hasattr(metric_result, "tolist") else list(metric_result)
+
+def _metric_for(metric: str, eval_llm, eval_embeddings=None) -> Any:
+    """Return a cached RAGAS metric instance bound to the given LLM and embeddings."""
+    # Per thread, so concurrently scored chunks never share a metric's run state
+    cache_key = (metric, threading.get_ident())
+    with _MEMO_LOCK:
+        instance = _METRIC_INSTANCES.get(cache_key)
+    if instance is None:
+        instance = _METRIC_CLASSES[metric]()
+        with _MEMO_LOCK:
+            if len(_METRIC_INSTANCES) >= _METRIC_INSTANCES_SIZE:
+                _METRIC_INSTANCES.pop(next(iter(_METRIC_INSTANCES)))
+            _METRIC_INSTANCES[cache_key] = instance
+    
+    # Rebind on every call: RAGAS only fills in llm/embeddings that are still unset, so
+    # the instance would otherwise keep clients bound to an earlier evaluate()'s loop
+    if hasattr(instance, "llm"):
+        instance.llm = eval_llm
+    if hasattr(instance, "embeddings"):
+        instance.embeddings = eval_embeddings
+    if getattr(instance, "answer_similarity", None) is not None:
+        # AnswerCorrectness builds this from its embeddings on first use; let it rebuild
+        instance.answer_similarity = None
+    return instance
+
+def _evaluate_unified_metrics_batch(eval_dataset, eval_llm, metrics: List[str], eval_embeddings=None) -> Tuple[Dict[str, Any], List[str]]:
+    """Unified batch evaluation for all RAGAS metrics in a single call.
+    
+    If the call fails as a whole, the metrics are bisected and retried so
+    one failing metric doesn't take the scores of the others with it.
+    """
+    if len(eval_dataset) == 0:
+        return {}, []
+    
     try:
-        from ragas.metrics import (
-            Faithfulness, AnswerRelevancy, 
-            LLMContextPrecisionWithoutReference, ContextRelevance,
-            AnswerSimilarity, AnswerCorrectness,
-            ContextPrecision, ContextRecall
-        )
-        from ragas import evaluate
-        
-        # Build metric instances for all requested metrics
-        metric_instances = []
-        metric_name_mapping = {}
-        
-        for metric in metrics:
-            if metric == 'faithfulness':
-                metric_instances.append(Faithfulness())
-                metric_name_mapping['faithfulness'] = 'faithfulness'
-            elif metric == 'answer_relevancy':
-                metric_instances.append(AnswerRelevancy())
-                metric_name_mapping['answer_relevancy'] = 'answer_relevancy'
-            elif metric == 'context_precision_without_reference':
-                metric_instances.append(LLMContextPrecisionWithoutReference())
-                metric_name_mapping['context_precision_without_reference'] = 'llm_context_precision_without_reference'
-            elif metric == 'context_relevancy':
-                metric_instances.append(ContextRelevance())
-                metric_name_mapping['context_relevancy'] = 'nv_context_relevance'
-            elif metric == 'answer_similarity':
-                metric_instances.append(AnswerSimilarity())
-                metric_name_mapping['answer_similarity'] = 'semantic_similarity'
-            elif metric == 'answer_correctness':
-                metric_instances.append(AnswerCorrectness())
-                metric_name_mapping['answer_correctness'] = 'answer_correctness'
-            elif metric == 'context_precision':
-                metric_instances.append(ContextPrecision())
-                metric_name_mapping['context_precision'] = 'context_precision'
-            elif metric == 'context_recall':
-                metric_instances.append(ContextRecall())
-                metric_name_mapping['context_recall'] = 'context_recall'
+        # Reuse metric instances (and their compiled prompts) across batches
+        metric_instances = [_metric_for(metric, eval_llm, eval_embeddings)
+                            for metric in metrics if metric in _RAGAS_SCORE_KEYS]
         
         if not metric_instances:
             return {}, []
@@ -858,32 +1161,32 @@ def _evaluate_unified_metrics_batch(eval_dataset, eval_llm, metrics: List[str])
         monitor = get_monitor()
         monitor.increment_counter("openai_api_calls", len(metric_instances))
         
-        # Single unified RAGAS evaluation call
-        result = evaluate(dataset=eval_dataset, metrics=metric_instances)
+        # Single unified RAGAS evaluation call; RAGAS fans the metric x sample
+        # jobs out concurrently, bounded by RAGAS_MAX_WORKERS
+        result = evaluate(
+            dataset=eval_dataset,
+            metrics=metric_instances,
+            llm=eval_llm,
+            embeddings=eval_embeddings,
+            run_config=_ragas_run_config()
+        )
         
         # Extract results for all metrics
         results = {}
         errors = []
         
         for metric_name in metrics:
-            ragas_key = metric_name_mapping.get(metric_name, metric_name)
+            ragas_key = _RAGAS_SCORE_KEYS.get(metric_name, metric_name)
             
-            if hasattr(result, 'scores') and isinstance(result.scores, list) and len(result.scores) > 0:
-                # Extract scores from list of dicts
-                scores = [score_dict.get(ragas_key) for score_dict in result.scores if ragas_key in score_dict]
-                if scores and all(score is not None for score in scores):
-                    results[metric_name] = scores
-                    logger.info(f"Successfully extracted {len(scores)} scores for {metric_name} (ragas key: {ragas_key})")
-                else:
-                    errors.append(f"{metric_name}: No valid scores found for {ragas_key}")
-                    logger.warning(f"No valid scores for {metric_name} (ragas key: {ragas_key})")
-            elif hasattr(result, ragas_key):
-                metric_result = getattr(result, ragas_key)
-                results[metric_name] = metric_result.tolist() if hasattr(metric_result, 'tolist') else metric_result
-                logger.info(f"Successfully extracted attribute result for {metric_name}")
+            scores = _extract_scores(result, ragas_key)
+            if scores:
+                # NaN means RAGAS could not score that sample (e.g. faithfulness of an
+                # "I don't know" answer); only that cell becomes None, the rest are kept
+                results[metric_name] = [score if _is_score(score) else None for score in scores]
+                logger.info(f"Successfully extracted {len(scores)} scores for {metric_name} (ragas key: {ragas_key})")
             else:
-                errors.append(f"{metric_name}: No result found for {ragas_key}")
-                logger.warning(f"No result found for {metric_name} (ragas key: {ragas_key})")
+                errors.append(f"{metric_name}: No valid scores found for {ragas_key}")
+                logger.warning(f"No valid scores for {metric_name} (ragas key: {ragas_key})")
         
         logger.info(f"Unified batch evaluation completed: {len(results)} successful, {len(errors)} errors")
         return results, errors
@@ -891,17 +1194,82 @@ def _evaluate_unified_metrics_batch(eval_dataset, eval_llm, metrics: List[str])
     except Exception as e:
         error_msg = f"Unified batch metrics evaluation error: {str(e)}"
         logger.error(error_msg)
-        import traceback
-        logger.error(traceback.format_exc())
+        # Formatting walks every frame and reads source lines; only pay for it when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+    
+    known_metrics = [metric for metric in metrics if metric in _RAGAS_SCORE_KEYS]
+    if len(known_metrics) < 2:
         return {}, [error_msg]
+    
+    # Isolate the failing metric(s): retry each half in its own fused call
+    mid = len(known_metrics) // 2
+    logger.info(f"Retrying {len(known_metrics)} metrics in two groups to isolate the failure")
+    results, errors = {}, []
+    for group in (known_metrics[:mid], known_metrics[mid:]):
+        group_results, group_errors = _evaluate_unified_metrics_batch(eval_dataset, eval_llm, group, eval_embeddings)
+        results.update(group_results)
+        errors.extend(group_errors)
+    return results, errors
+
 
+def _prepare_dataset(evaluation_data: List[Dict[str, Any]]) -> Tuple[Optional[Tuple[List[Dict[str, Any]], bool, bool, Any]], Optional[str]]:
+    """Build the RAGAS samples and EvaluationDataset for the given data.
+    
+    Returns:
+        Tuple of ((samples, has_contexts, has_references, eval_dataset), error_message)
+    """
+    samples, has_contexts, error_msg = prepare_evaluation_data(evaluation_data)
+    if error_msg:
+        return None, error_msg
+    
+    # Check for reference answers availability
+    has_references = False
+    ground_truths = [item.get("ground_truths") for item in evaluation_data]
+    if not any(gt is not None for gt in ground_truths):
+        logger.warning("No 'ground_truths' found in evaluation data")
+    elif not logger.isEnabledFor(logging.INFO):
+        # The row count is only logged; stop at the first meaningful reference instead
+        has_references = any(
+            isinstance(gt, list) and any(isinstance(ref, str) and ref.strip() for ref in gt)
+            for gt in ground_truths
+        )
+    else:
+        # Check if we have meaningful reference answers (not just empty strings):
+        # blank-check all references in one vectorized pass, then count the rows
+        # owning at least one non-blank reference
+        ref_lengths = np.fromiter(
+            (len(gt) if isinstance(gt, list) else 0 for gt in ground_truths),
+            dtype=np.int64,
+            count=len(ground_truths),
+        )
+        flat_refs = [ref for gt in ground_truths if isinstance(gt, list) for ref in gt]
+        non_blank = np.ones(len(flat_refs), dtype=bool)
+        non_blank[_blank_positions(flat_refs)] = False
+        ref_rows = np.repeat(np.arange(len(ground_truths)), ref_lengths)[non_blank]
+        ref_count = int(np.unique(ref_rows).size)
+        has_references = ref_count > 0
+        logger.info(f"Reference analysis: {ref_count}/{len(samples)} rows have reference answers")
+    
+    # Convert to EvaluationDataset
+    try:
+        eval_dataset = EvaluationDataset.from_list(samples)
+        logger.info(f"Created EvaluationDataset with {len(eval_dataset)} samples")
+    except Exception as e:
+        error_msg = f"Error creating EvaluationDataset: {str(e)}"
+        logger.error(error_msg)
+        return None, error_msg
+    
+    return (samples, has_contexts, has_references, eval_dataset), None
 
 def run_ragas_evaluation(
     evaluation_data: List[Dict[str, Any]], 
-    openai_model: str = "gpt-4o",
+    openai_model: str = "gpt-4o-mini",
     openai_api_key: Optional[str] = None,
     enable_reference_metrics: bool = False,
     metrics_mode: str = "full",
+    eval_batch_size: int = 10,
+    checkpoint_path: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Run RAGAS evaluation on the given data
     
@@ -911,27 +1279,27 @@ def run_ragas_evaluation(
         openai_api_key: OpenAI API key (will use env var if None)
         enable_reference_metrics: If True, enable metrics that require reference answers
         metrics_mode: Metrics evaluation mode - 'basic', 'full', or 'reference-only'
+        eval_batch_size: Number of samples per RAGAS evaluate() call
+        checkpoint_path: Optional CSV file for resumable evaluation
+            (defaults to the RAG_EVAL_RAGAS_CHECKPOINT environment variable)
         
     Returns:
         Dictionary with evaluation results or error
     """
     monitor = get_monitor()
+    checkpoint_path = checkpoint_path or os.getenv("RAG_EVAL_RAGAS_CHECKPOINT")
     
     logger.info(f"Starting RAGAS evaluation with enable_reference_metrics={enable_reference_metrics}, metrics_mode={metrics_mode}...")
     
-    # Define metrics for each mode
-    BASIC_METRICS = ['faithfulness', 'answer_relevancy', 'context_precision_without_reference', 'context_relevancy']
-    REFERENCE_METRICS = ['answer_similarity', 'answer_correctness', 'context_precision', 'context_recall']
-    
     # Determine which metrics to evaluate based on mode
     if metrics_mode == 'basic':
-        target_metrics = BASIC_METRICS
+        target_metrics = list(BASIC_METRICS)
         logger.info(f"Basic mode: evaluating {len(target_metrics)} metrics")
     elif metrics_mode == 'reference-only':
-        target_metrics = REFERENCE_METRICS
+        target_metrics = list(REFERENCE_METRICS)
         logger.info(f"Reference-only mode: evaluating {len(target_metrics)} metrics")
     else:  # metrics_mode == 'full'
-        target_metrics = BASIC_METRICS + (REFERENCE_METRICS if enable_reference_metrics else [])
+        target_metrics = list(BASIC_METRICS + (REFERENCE_METRICS if enable_reference_metrics else ()))
         logger.info(f"Full mode: evaluating {len(target_metrics)} metrics (reference metrics: {enable_reference_metrics})")
     
     logger.info(f"Target metrics: {target_metrics}")
@@ -947,7 +1315,7 @@ def run_ragas_evaluation(
     # Setup RAGAS
     logger.info("Setting up RAGAS metrics...")
     ragas_available, metric_classes, metric_names, error_message = setup_ragas(enable_reference_metrics)
-    logger.info(f"DEBUG: setup_ragas returned - available: {ragas_available}, metric_names: {metric_names}")
+    logger.debug("setup_ragas returned - available: %s, metric_names: %s", ragas_available, metric_names)
     if not ragas_available:
         return {"error": error_message}
     
@@ -955,44 +1323,20 @@ def run_ragas_evaluation(
     
     try:
         # Prepare evaluation data
-        eval_df, has_contexts, error_msg = prepare_evaluation_data(evaluation_data)
-        if error_msg:
-            return {"error": error_msg}
-        
-        # Check for reference answers availability
-        has_references = False
-        if 'ground_truths' in eval_df.columns:
-            # Check if we have meaningful reference answers (not just empty strings)
-            non_empty_refs = eval_df['ground_truths'].apply(
-                lambda x: any(ref.strip() for ref in x) if isinstance(x, list) and x else False
-            )
-            has_references = non_empty_refs.any()
-            ref_count = non_empty_refs.sum()
-            logger.info(f"Reference analysis: {ref_count}/{len(eval_df)} rows have reference answers")
-            
-            if enable_reference_metrics and not has_references:
-                logger.warning("Reference metrics requested but no reference answers found - some metrics will be skipped")
-        else:
-            logger.warning("No 'ground_truths' column found")
-        
-        # Create LLM for evaluation
-        eval_llm, error_msg = create_evaluation_llm(openai_model, api_key)
+        prepared, error_msg = _prepare_dataset(evaluation_data)
         if error_msg:
             return {"error": error_msg}
+        samples, has_contexts, has_references, eval_dataset = prepared
         
-        # Convert to EvaluationDataset
-        try:
-            from ragas import EvaluationDataset
-            eval_dataset = EvaluationDataset.from_pandas(eval_df)
-            logger.info(f"Created EvaluationDataset with {len(eval_dataset)} samples")
-        except Exception as e:
-            error_msg = f"Error creating EvaluationDataset: {str(e)}"
-            logger.error(error_msg)
-            return {"error": error_msg}
+        if enable_reference_metrics and not has_references:
+            logger.warning("Reference metrics requested but no reference answers found - some metrics will be skipped")
         
-        # Use batch evaluation for better performance
-        results, successful_metrics, errors = evaluate_metrics_batch(
-            eval_dataset, eval_llm, target_metrics, has_contexts, has_references
+        # Evaluate in checkpointed batches so one failure doesn't discard all prior work;
+        # every batch gets its own LLM and embeddings clients (see _create_evaluation_models)
+        results, successful_metrics, errors = evaluate_metrics_in_batches(
+            eval_dataset, samples, None, target_metrics, has_contexts, has_references,
+            openai_model, batch_size=eval_batch_size, checkpoint_path=checkpoint_path,
+            model_factory=functools.partial(_create_evaluation_models, openai_model, api_key)
         )
         
         # Log evaluation results
@@ -1015,11 +1359,51 @@ def run_ragas_evaluation(
     except Exception as e:
         error_msg = f"Error in run_ragas_evaluation: {str(e)}"
         logger.error(error_msg)
-        import traceback
-        logger.error(traceback.format_exc())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
         return {"error": error_msg}
 
 
+def _merge_ragas_results(chunk_results: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Combine run_ragas_evaluation outputs of several chunks into one result.
+    
+    Args:
+        chunk_results: (sample count, run_ragas_evaluation result) per chunk, in order
+        
+    Returns:
+        A run_ragas_evaluation-style dictionary whose metric lists span all chunks;
+        samples of chunks that failed or lack a metric get None for it
+    """
+    if len(chunk_results) == 1:
+        return chunk_results[0][1]
+    
+    successful = [result for _, result in chunk_results if result.get("success")]
+    if not successful:
+        return chunk_results[0][1]
+    
+    metric_names = list(dict.fromkeys(name for result in successful for name in result.get("metric_names", [])))
+    metrics = {name: [] for name in metric_names}
+    errors = []
+    for count, result in chunk_results:
+        if result.get("success"):
+            chunk_metrics = result.get("metrics", {})
+            errors.extend(result.get("errors", []))
+        else:
+            chunk_metrics = {}
+            errors.append(result.get("error", "Unknown error"))
+        for name in metric_names:
+            values = chunk_metrics.get(name)
+            metrics[name].extend(values if values is not None and len(values) == count else [None] * count)
+    
+    return {
+        "success": True,
+        "metrics": metrics,
+        "metric_names": metric_names,
+        "has_contexts": any(result.get("has_contexts") for result in successful),
+        "total_samples": sum(count for count, _ in chunk_results),
+        "errors": errors
+    }
+
 async def evaluate_queries(
     queries: List[str],
     kb_name: str,
@@ -1034,8 +1418,15 @@ async def evaluate_queries(
     ragas_status_callback=None,
     use_batch_processing: bool = True,
     batch_size: int = 5,
-    max_concurrent: int = 3,
-    save_performance_report: bool = False
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    save_performance_report: bool = False,
+    require_ragas: bool = False,
+    pipeline_batch_size: int = 10,
+    max_concurrent_ragas_chunks: int = RAGAS_MAX_CONCURRENT_CHUNKS,
+    use_cache: bool = False,
+    cache_path: Optional[str] = None,
+    cache_tag: Optional[str] = None,
+    reset_monitoring: bool = True
 ) -> Dict[str, Any]:
     """Evaluate a list of queries against a knowledge base
     
@@ -1055,6 +1446,17 @@ async def evaluate_queries(
         batch_size: Number of queries per batch
         max_concurrent: Maximum concurrent requests per batch
         save_performance_report: Save performance report to JSON file (default: False)
+        require_ragas: Fail before generating any RAG responses if RAGAS scoring
+            cannot run (no OpenAI API key or RAGAS not installed)
+        pipeline_batch_size: Finished responses per RAGAS chunk; each chunk is scored while
+            the remaining responses are still generated (0 scores everything at the end)
+        max_concurrent_ragas_chunks: How many finished chunks RAGAS may score at the same
+            time when generation outpaces scoring (mind OpenAI rate limits)
+        use_cache: Reuse RAG responses stored by earlier runs (see generate_rag_responses)
+        cache_path: Response cache database file (defaults to RAG_EVAL_CACHE_PATH)
+        cache_tag: Response cache tag (defaults to RAG_EVAL_CACHE_TAG)
+        reset_monitoring: Start a fresh performance monitoring session for this call;
+            pass False when the caller has already started one it wants to keep
         
     Returns:
         Dictionary with evaluation results
@@ -1064,102 +1466,204 @@ async def evaluate_queries(
     if not is_valid:
         return {"error": error_msg}
     
+    # Fail fast instead of paying for a full RAG run whose scores can't be computed
+    if require_ragas:
+        if not (openai_api_key or os.environ.get("OPENAI_API_KEY")):
+            return {"error": "OpenAI API key not provided"}
+        if not _RAGAS_AVAILABLE:
+            return {"error": setup_ragas()[3]}
+    
     # Determine metrics evaluation mode
     if metrics_mode == 'reference-only':
         # Reference-only mode requires reference answers
         if not reference_answers or not any(ref.strip() for ref in reference_answers):
             return {"error": "reference-only mode requires reference answers"}
         enable_reference_metrics = True
-        logger.info("DEBUG: Reference-only mode - will evaluate only reference-based metrics")
+        logger.debug("Reference-only mode - will evaluate only reference-based metrics")
     elif metrics_mode == 'basic':
         # Basic mode never uses reference metrics
         enable_reference_metrics = False
-        logger.info("DEBUG: Basic mode - will evaluate only basic metrics (no reference required)")
+        logger.debug("Basic mode - will evaluate only basic metrics (no reference required)")
     else:  # metrics_mode == 'full'
         # Full mode uses reference metrics if available
         enable_reference_metrics = reference_answers is not None and any(ref.strip() for ref in reference_answers)
-        logger.info(f"DEBUG: Full mode - reference metrics enabled: {enable_reference_metrics}")
+        logger.debug("Full mode - reference metrics enabled: %s", enable_reference_metrics)
     
-    logger.info(f"DEBUG: Metrics mode: {metrics_mode}, enable_reference_metrics: {enable_reference_metrics}")
-    if reference_answers:
-        logger.info(f"DEBUG: Reference answers count: {len(reference_answers)}, non-empty: {sum(1 for ref in reference_answers if ref.strip())}")
+    logger.debug("Metrics mode: %s, enable_reference_metrics: %s", metrics_mode, enable_reference_metrics)
+    if reference_answers and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Reference answers count: %d, non-empty: %d",
+                     len(reference_answers), sum(1 for ref in reference_answers if ref.strip()))
     
-    # Initialize performance monitoring for Streamlit path
-    from performance_monitor import reset_monitor
-    reset_monitor()
+    # Each evaluation reports on its own session unless the caller manages one
+    if reset_monitoring:
+        reset_monitor()
+        get_monitor().start_monitoring()
     monitor = get_monitor()
-    monitor.start_monitoring()
     
-    # Generate RAG responses
-    rag_results, logs = await generate_rag_responses(
-        queries=queries,
-        kb_name=kb_name,
-        rag_api_url=rag_api_url,
-        username=username,
-        password=password,
-        reference_answers=reference_answers,
-        progress_callback=progress_callback,
-        use_batch_processing=use_batch_processing,
-        batch_size=batch_size,
-        max_concurrent=max_concurrent
-    )
-    
-    # Calculate response time stats
-    response_times = [result.get("response_time", 0) for result in rag_results]
-    avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-    
-    # Run RAGAS evaluation if OpenAI API key is available
-    ragas_results = {"error": "OpenAI API key not provided"}
+    use_ragas = bool(openai_api_key or os.environ.get("OPENAI_API_KEY"))
     if ragas_status_callback:
-        if openai_api_key or os.environ.get("OPENAI_API_KEY"):
+        if use_ragas:
             ragas_status_callback("Running RAGAS evaluation...")
         else:
             ragas_status_callback("Skipping RAGAS evaluation: OpenAI API key not provided")
+    
+    # Producer/consumer pipeline: RAG responses are generated in one run (one session,
+    # one cache, deduplicated across all queries) and every chunk_size finished rows
+    # are scored by RAGAS while the remaining responses are still being generated
+    chunk_size = max(1, pipeline_batch_size or len(queries))
+    chunk_queue: asyncio.Queue = asyncio.Queue()
+    rag_results: List[Dict[str, Any]] = []
+    logs: List[Dict[str, Any]] = []
+    evaluable_indices: List[int] = []
+    ragas_chunks: List[Tuple[int, Dict[str, Any]]] = []
+    
+    async def produce_rag_chunks() -> None:
+        # (query index, result row) pairs finished since the last chunk was queued
+        finished: List[Tuple[int, Dict[str, Any]]] = []
+        
+        def on_result(i: int, total: int, query: str, result: Dict[str, Any]) -> None:
+            if progress_callback:
+                progress_callback(i, total, query, result)
+            finished.append((i, result))
+            if len(finished) >= chunk_size:
+                chunk_queue.put_nowait(finished[:])
+                finished.clear()
+        
+        try:
+            results, run_logs = await generate_rag_responses(
+                queries=queries,
+                kb_name=kb_name,
+                rag_api_url=rag_api_url,
+                username=username,
+                password=password,
+                reference_answers=reference_answers,
+                progress_callback=on_result,
+                use_batch_processing=use_batch_processing,
+                batch_size=batch_size,
+                max_concurrent=max_concurrent,
+                use_cache=use_cache,
+                cache_path=cache_path,
+                cache_tag=cache_tag
+            )
+            rag_results.extend(results)
+            logs.extend(run_logs)
+            if finished:
+                chunk_queue.put_nowait(finished[:])
+        finally:
+            # Always release the consumer, even if generation failed
+            chunk_queue.put_nowait(None)
+    
+    ragas_semaphore = asyncio.Semaphore(max(1, max_concurrent_ragas_chunks))
+    
+    async def score_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        async with ragas_semaphore:
+            logger.debug("Calling run_ragas_evaluation for %d queries with enable_reference_metrics=%s, metrics_mode=%s",
+                         len(chunk), enable_reference_metrics, metrics_mode)
+            # RAGAS blocks on LLM calls and drives its own event loop, so run it in a
+            # worker thread: this loop stays responsive and RAGAS never has to nest
+            # inside it (nest_asyncio cannot patch a uvloop loop)
+            chunk_ragas = await asyncio.to_thread(
+                run_ragas_evaluation,
+                evaluation_data=[row for _, row in chunk],
+                openai_model=openai_model,
+                openai_api_key=openai_api_key,
+                enable_reference_metrics=enable_reference_metrics,
+                metrics_mode=metrics_mode
+            )
+        # Recorded together, so scores stay aligned with indices whatever order chunks finish in
+        evaluable_indices.extend(i for i, _ in chunk)
+        ragas_chunks.append((len(chunk), chunk_ragas))
+        
+        # Publish this chunk's scores on its rows right away instead of after the last chunk;
+        # misaligned score lists are dropped rather than put onto the wrong rows
+        if chunk_ragas.get("success"):
+            chunk_metrics = chunk_ragas.get("metrics", {})
+            missing_scores = [None] * len(chunk)
+            columns = {}
+            for metric in chunk_ragas.get("metric_names", []):
+                values = chunk_metrics.get(metric)
+                if values is not None and len(values) != len(chunk):
+                    logger.warning(f"RAGAS metric '{metric}' only has {len(values)} values for {len(chunk)} queries - setting to None")
+                    values = None
+                columns[metric] = values if values is not None else missing_scores
+            # Transpose the metric columns into rows and merge each with one update()
+            names = list(columns)
+            for (_, row), row_scores in zip(chunk, zip(*columns.values())):
+                row.update(zip(names, row_scores))
+        if ragas_status_callback:
+            ragas_status_callback(f"RAGAS scored {len(evaluable_indices)} of {len(queries)} responses...")
+    
+    async def score_rag_chunks() -> None:
+        scoring_tasks = []
+        while (chunk := await chunk_queue.get()) is not None:
+            if not use_ragas:
+                continue
+            
+            # Only well-formed responses are scored; failed or empty ones keep None metrics
+            chunk = [
+                (i, row) for i, row in chunk
+                if "error" not in row and row.get("answer") and row.get("contexts")
+            ]
+            if not chunk:
+                continue
             
-    if openai_api_key or os.environ.get("OPENAI_API_KEY"):
-        logger.info(f"DEBUG: Calling run_ragas_evaluation with enable_reference_metrics={enable_reference_metrics}, metrics_mode={metrics_mode}")
-        ragas_results = run_ragas_evaluation(
-            evaluation_data=rag_results,
-            openai_model=openai_model,
-            openai_api_key=openai_api_key,
-            enable_reference_metrics=enable_reference_metrics,
-            metrics_mode=metrics_mode
+            scoring_tasks.append(asyncio.ensure_future(score_chunk(chunk)))
+        await asyncio.gather(*scoring_tasks)
+    
+    await asyncio.gather(produce_rag_chunks(), score_rag_chunks())
+    
+    # Calculate response time stats
+    response_times = np.fromiter(
+        (result.get("response_time", 0.0) for result in rag_results),
+        dtype=np.float64,
+        count=len(rag_results)
+    )
+    if response_times.size:
+        avg_response_time = float(response_times.mean())
+        p50_response_time, p95_response_time, p99_response_time = (
+            float(p) for p in np.percentile(response_times, [50, 95, 99])
         )
-        logger.info(f"DEBUG: RAGAS evaluation completed, results keys: {list(ragas_results.keys()) if isinstance(ragas_results, dict) else 'Not a dict'}")
+    else:
+        avg_response_time = p50_response_time = p95_response_time = p99_response_time = 0.0
+    
+    ragas_results = {"error": "OpenAI API key not provided"}
+    if use_ragas:
+        skipped_count = len(rag_results) - len(evaluable_indices)
+        if skipped_count:
+            logger.warning(f"Skipping RAGAS evaluation for {skipped_count}/{len(rag_results)} failed or empty responses")
+        
+        if ragas_chunks:
+            ragas_results = _merge_ragas_results(ragas_chunks)
+            logger.debug("RAGAS evaluation completed, results keys: %s", list(ragas_results))
+        else:
+            ragas_results = {"error": "No successful RAG responses to evaluate"}
         
         if "success" in ragas_results and ragas_results["success"]:
             # Add metrics to individual results for backwards compatibility
             metrics_data = ragas_results.get("metrics", {})
             metric_names = ragas_results.get("metric_names", [])
-            logger.info(f"DEBUG: RAGAS success - metrics_data keys: {list(metrics_data.keys())}")
-            logger.info(f"DEBUG: RAGAS metric_names: {metric_names}")
-            logger.info(f"DEBUG: Reference metrics in results: {[m for m in metric_names if m in ['answer_similarity', 'answer_correctness', 'context_precision', 'context_recall']]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("RAGAS success - metrics_data keys: %s", list(metrics_data))
+                logger.debug("RAGAS metric_names: %s", metric_names)
+                logger.debug("Reference metrics in results: %s", [m for m in metric_names if m in REFERENCE_METRICS])
             
             # Check for incomplete metric evaluation (common RAGAS issue)
-            expected_results = len(rag_results)
-            for metric, values in metrics_data.items():
-                if len(values) != expected_results:
-                    logger.warning(f"RAGAS metric '{metric}' only has {len(values)} values for {expected_results} queries")
+            for metric in metric_names:
+                if metrics_data.get(metric) is None:
+                    logger.warning("RAGAS failed to evaluate '%s' - setting to None", metric)
             
-            for i, result in enumerate(rag_results):
-                logger.info(f"DEBUG: Processing result {i+1} - existing keys: {list(result.keys())}")
+            # Scores were added to each chunk's rows as soon as it was scored; skipped
+            # rows and chunks lacking a metric keep None to indicate failed evaluation
+            for result in rag_results:
                 for metric in metric_names:
-                    if metric in metrics_data and i < len(metrics_data[metric]):
-                        result[metric] = metrics_data[metric][i]
-                        logger.info(f"DEBUG: Added metric '{metric}' = {metrics_data[metric][i]} to result {i+1}")
-                    else:
-                        # For missing metrics, assign None to indicate failed evaluation
-                        result[metric] = None
-                        logger.warning(f"DEBUG: RAGAS failed to evaluate '{metric}' for query {i+1} - setting to None")
-                logger.info(f"DEBUG: Result {i+1} final keys: {list(result.keys())}")
+                    result.setdefault(metric, None)
+            logger.debug("Added %d metrics %s to %d results", len(metric_names), metric_names, len(evaluable_indices))
 
     # Stop performance monitoring
     monitor.stop_monitoring()
     
     # Save performance report if requested
     if save_performance_report:
-        import time
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_filename = f"performance_reports/evaluation_report_{timestamp}.json"
         try:
@@ -1189,16 +1693,26 @@ async def evaluate_queries(
         "queries": queries,
         "rag_results": rag_results,
         "avg_response_time": avg_response_time,
+        "p50_response_time": p50_response_time,
+        "p95_response_time": p95_response_time,
+        "p99_response_time": p99_response_time,
         "ragas_results": ragas_results,
         "logs": logs,
         "performance_summary": performance_summary
     }
 
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the module's reusable event loop, creating it on first use."""
+    global _EVENT_LOOP
+    if _EVENT_LOOP is None or _EVENT_LOOP.is_closed():
+        _EVENT_LOOP = _new_event_loop()
+    return _EVENT_LOOP
+
 def run_headless_evaluation(
     kb_name: str, 
     queries: Optional[List[str]] = None,
     reference_answers: Optional[List[str]] = None,
-    openai_model: str = "gpt-4o",
+    openai_model: str = "gpt-4o-mini",
     openai_api_key: Optional[str] = None,
     rag_api_url: str = "http://localhost:8000",
     username: str = "admin@example.com",
@@ -1206,7 +1720,11 @@ def run_headless_evaluation(
     metrics_mode: str = "full",
     progress_callback=None,
     ragas_status_callback=None,
-    save_performance_report: bool = False
+    save_performance_report: bool = False,
+    reuse_loop: bool = True,
+    use_cache: bool = False,
+    cache_path: Optional[str] = None,
+    cache_tag: Optional[str] = None
 ) -> Dict[str, Any]:
     """Run a headless evaluation on the specified knowledge base
     
@@ -1223,46 +1741,75 @@ def run_headless_evaluation(
         progress_callback: Optional callback for query progress updates
         ragas_status_callback: Optional callback for RAGAS status updates
         save_performance_report: Save performance report to JSON file (default: False)
+        reuse_loop: Run on a module-level event loop kept across calls instead of
+            creating and closing one per call
+        use_cache: Reuse RAG responses stored by earlier runs (see generate_rag_responses)
+        cache_path: Response cache database file (defaults to RAG_EVAL_CACHE_PATH)
+        cache_tag: Response cache tag (defaults to RAG_EVAL_CACHE_TAG)
         
     Returns:
         Dictionary with evaluation results
+        
+    Raises:
+        RuntimeError: If called while an event loop is running; await
+            evaluate_queries() from async code instead
     """
+    # Use default queries if none provided
+    queries = tuple(queries) if queries is not None else DEFAULT_TEST_QUERIES
+    
+    evaluation = functools.partial(
+        evaluate_queries,
+        queries=queries,
+        kb_name=kb_name,
+        openai_model=openai_model,
+        openai_api_key=openai_api_key,
+        rag_api_url=rag_api_url,
+        username=username,
+        password=password,
+        reference_answers=reference_answers,
+        metrics_mode=metrics_mode,
+        progress_callback=progress_callback,
+        ragas_status_callback=ragas_status_callback,
+        save_performance_report=save_performance_report,
+        use_cache=use_cache,
+        cache_path=cache_path,
+        cache_tag=cache_tag,
+        # The session started below also covers the wrapping measure_operation()
+        reset_monitoring=False
+    )
+    
+    # A running loop can't be blocked on; async callers must await evaluate_queries()
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError(
+            "run_headless_evaluation() cannot be called from a running event loop; "
+            "await evaluate_queries(...) instead"
+        )
+    
     # Initialize performance monitoring
-    from performance_monitor import reset_monitor
     reset_monitor()  # Clear any previous monitoring data
     monitor = get_monitor()
     monitor.start_monitoring()
     
     try:
-        # Use default queries if none provided
-        if queries is None:
-            queries = DEFAULT_TEST_QUERIES
-        
         with monitor.measure_operation("full_headless_evaluation",
                                      query_count=len(queries),
                                      metrics_mode=metrics_mode,
                                      kb_name=kb_name):
             # Run evaluation asynchronously
-            result = asyncio.run(evaluate_queries(
-                queries=queries,
-                kb_name=kb_name,
-                openai_model=openai_model,
-                openai_api_key=openai_api_key,
-                rag_api_url=rag_api_url,
-                username=username,
-                password=password,
-                reference_answers=reference_answers,
-                metrics_mode=metrics_mode,
-                progress_callback=progress_callback,
-                ragas_status_callback=ragas_status_callback,
-                save_performance_report=save_performance_report
-            ))
+            if reuse_loop:
+                result = _get_event_loop().run_until_complete(evaluation())
+            else:
+                with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+                    result = runner.run(evaluation())
             
             return result
             
     except Exception as e:
         logger.error(f"Error in headless evaluation: {str(e)}")
-        import traceback
         logger.error(traceback.format_exc())
         return {
             "kb_name": kb_name,
@@ -1275,8 +1822,6 @@ def run_headless_evaluation(
         
         # Save performance report if requested (for error cases)
         if save_performance_report:
-            import time
-            from datetime import datetime
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_filename = f"performance_reports/evaluation_report_error_{timestamp}.json"
             try:
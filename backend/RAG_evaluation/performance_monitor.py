@@ -6,22 +6,83 @@ operations during RAG evaluation to identify bottlenecks and measure
 optimization improvements.
 """
 
+import heapq
+import itertools
+import os
+import sys
 import time
 import psutil
+import re
 import threading
-from typing import Dict, List, Any, Optional, ContextManager
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Any, Optional, ContextManager
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("rag_evaluation")
 
-@dataclass
+# Set RAG_EVAL_PERF_MONITORING=false to skip per-operation timing and memory sampling
+PERFORMANCE_MONITORING = os.getenv("RAG_EVAL_PERF_MONITORING", "true").lower() != "false"
+
+# Set RAG_EVAL_PERF_MEMORY=false to keep timings but skip every psutil memory read
+MEMORY_SAMPLING = os.getenv("RAG_EVAL_PERF_MEMORY", "true").lower() != "false"
+
+# Seconds between background peak-memory samples; 0 samples only at operation boundaries
+MEMORY_SAMPLE_INTERVAL = float(os.getenv("RAG_EVAL_MEMORY_SAMPLE_INTERVAL", "0"))
+
+# Most recent individual measurements kept for the report; older ones only live on
+# in the per-operation aggregates
+METRICS_HISTORY_SIZE = 10_000
+
+# Number of slowest operations listed in the report
+SLOWEST_OPERATIONS = 10
+
+# Report bucket -> operation-name substrings that count towards it
+REPORT_CATEGORIES = {
+    "rag": ("rag_api", "rag_batch", "rag_responses"),
+    "ragas": ("ragas_eval", "batch_eval"),
+    **{metric_name: (metric_name,) for metric_name in [
+        "faithfulness", "answer_relevancy", "context_precision", "context_relevancy",
+        "answer_similarity", "answer_correctness", "context_recall"]}
+}
+# One alternation per bucket, so classifying a name is a single regex search per bucket
+_CATEGORY_PATTERNS = {category: re.compile("|".join(map(re.escape, terms)))
+                      for category, terms in REPORT_CATEGORIES.items()}
+
+
+@lru_cache(maxsize=None)
+def _report_categories(operation: str) -> tuple:
+    """Report buckets an operation name falls into (operation names repeat, so cached)."""
+    return tuple(category for category, pattern in _CATEGORY_PATTERNS.items()
+                 if pattern.search(operation))
+
+
+def _fold_duration(totals_by_key: Dict[str, List[float]], key: str, duration: float):
+    """Fold one duration into a [count, total, min, max] aggregate."""
+    totals = totals_by_key.get(key)
+    if totals is None:
+        totals_by_key[key] = [1, duration, duration, duration]
+    else:
+        totals[0] += 1
+        totals[1] += duration
+        totals[2] = min(totals[2], duration)
+        totals[3] = max(totals[3], duration)
+
+
+@dataclass(slots=True)
 class PerformanceMetric:
-    """Represents a single performance measurement."""
+    """Represents a single performance measurement (slotted: long runs keep thousands)."""
     operation: str
+    # time.perf_counter() readings: monotonic, so only meaningful as differences
     start_time: float
     end_time: Optional[float] = None
     duration: Optional[float] = None
@@ -36,7 +97,7 @@ class PerformanceMetric:
         if self.memory_end and self.memory_start:
             self.memory_delta = self.memory_end - self.memory_start
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationPerformanceReport:
     """Complete performance report for an evaluation run."""
     total_queries: int
@@ -49,6 +110,9 @@ class EvaluationPerformanceReport:
     failed_operations: int
     metrics_breakdown: Dict[str, float]
     operation_timings: List[PerformanceMetric]
+    operation_count: int = 0
+    # Slowest operations of the whole run, which may have left operation_timings
+    slowest_operations: List[PerformanceMetric] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert report to dictionary for JSON serialization."""
@@ -62,12 +126,13 @@ class EvaluationPerformanceReport:
             "openai_api_calls": self.openai_api_calls,
             "failed_operations": self.failed_operations,
             "metrics_breakdown": self.metrics_breakdown,
-            "operation_count": len(self.operation_timings),
-            "slowest_operations": sorted(
-                [{"operation": op.operation, "duration": op.duration, "metadata": op.metadata} 
-                 for op in self.operation_timings if op.duration], 
-                key=lambda x: x["duration"], reverse=True
-            )[:10]
+            "operation_count": self.operation_count or len(self.operation_timings),
+            "slowest_operations": [
+                {"operation": op.operation, "duration": op.duration, "metadata": op.metadata}
+                for op in self.slowest_operations or heapq.nlargest(
+                    SLOWEST_OPERATIONS, (op for op in self.operation_timings if op.duration),
+                    key=lambda op: op.duration)
+            ]
         }
 
 class PerformanceMonitor:
@@ -78,57 +143,87 @@ class PerformanceMonitor:
     to help identify bottlenecks and measure optimization improvements.
     """
     
-    def __init__(self):
-        self.metrics: List[PerformanceMetric] = []
-        self.active_operations: Dict[str, PerformanceMetric] = {}
+    def __init__(self, enabled: bool = PERFORMANCE_MONITORING,
+                 sample_interval: float = MEMORY_SAMPLE_INTERVAL,
+                 sample_memory: bool = MEMORY_SAMPLING):
+        self.enabled = enabled
+        self.sample_memory = sample_memory
+        self.sample_interval = sample_interval
+        self.metrics: Deque[PerformanceMetric] = deque(maxlen=METRICS_HISTORY_SIZE)
+        # operation name -> [count, total, min, max] duration over every measurement
+        self._operation_totals: Dict[str, List[float]] = {}
+        # report category -> the same aggregate, kept so the report never rescans operations
+        self._category_totals: Dict[str, List[float]] = {}
+        # min-heap of (duration, seq, metric) holding the slowest operations so far;
+        # seq breaks duration ties so metrics are never compared
+        self._slowest: List[tuple] = []
+        self._slowest_seq = itertools.count()
         self.counters: Dict[str, int] = {}
+        # RAGAS chunks are scored in worker threads, so counter and aggregate updates can race
+        self._lock = threading.Lock()
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
         self.peak_memory: float = 0
-        self.memory_monitor_active = False
         self.memory_monitor_thread: Optional[threading.Thread] = None
+        self._memory_monitor_stop = threading.Event()
+        # One Process handle for the monitor's lifetime instead of one per sample;
+        # None if it can't be opened, in which case memory reads as 0
+        try:
+            self._process: Optional[psutil.Process] = psutil.Process()
+        except psutil.Error:
+            self._process = None
         
     def start_monitoring(self):
         """Start the overall monitoring session."""
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
+        if not self.enabled or not self.sample_memory:
+            return
         self.peak_memory = self._get_memory_usage()
-        self._start_memory_monitoring()
+        # Peak memory is otherwise sampled at operation boundaries only
+        if self.sample_interval > 0:
+            self._start_memory_monitoring()
         logger.debug("Performance monitoring started")
         
     def stop_monitoring(self):
         """Stop the overall monitoring session."""
-        self.end_time = time.time()
+        self.end_time = time.perf_counter()
+        if self.enabled and self.sample_memory:
+            self._record_memory(self._get_memory_usage())
         self._stop_memory_monitoring()
         logger.debug("Performance monitoring stopped")
         
+    def _record_memory(self, memory: Optional[float]):
+        """Raise the recorded peak memory to the given sample if it is higher."""
+        if memory and memory > self.peak_memory:
+            self.peak_memory = memory
+        
     def _start_memory_monitoring(self):
-        """Start background thread to monitor peak memory usage."""
-        if self.memory_monitor_active:
+        """Start background thread to sample peak memory every sample_interval seconds."""
+        if self.memory_monitor_thread and self.memory_monitor_thread.is_alive():
             return
             
-        self.memory_monitor_active = True
+        self._memory_monitor_stop.clear()
         self.memory_monitor_thread = threading.Thread(target=self._monitor_memory, daemon=True)
         self.memory_monitor_thread.start()
         
     def _stop_memory_monitoring(self):
         """Stop background memory monitoring."""
-        self.memory_monitor_active = False
+        self._memory_monitor_stop.set()
         if self.memory_monitor_thread and self.memory_monitor_thread.is_alive():
             self.memory_monitor_thread.join(timeout=1.0)
             
     def _monitor_memory(self):
         """Background thread function to track peak memory usage."""
-        while self.memory_monitor_active:
-            current_memory = self._get_memory_usage()
-            if current_memory > self.peak_memory:
-                self.peak_memory = current_memory
-            time.sleep(0.5)  # Check every 500ms
+        # Event.wait() returns as soon as monitoring stops instead of sleeping it out
+        while not self._memory_monitor_stop.wait(self.sample_interval):
+            self._record_memory(self._get_memory_usage())
             
     def _get_memory_usage(self) -> float:
         """Get current memory usage in MB."""
+        if self._process is None:
+            return 0.0
         try:
-            process = psutil.Process()
-            return process.memory_info().rss / 1024 / 1024  # Convert to MB
+            return self._process.memory_info().rss / 1024 / 1024  # Convert to MB
         except Exception:
             return 0.0
             
@@ -143,39 +238,58 @@ class PerformanceMonitor:
             
         Yields:
             PerformanceMetric object that will be populated with timing data
+            (left unpopulated and unrecorded when monitoring is disabled)
         """
+        if not self.enabled:
+            yield PerformanceMetric(operation=operation, start_time=0.0, metadata=metadata)
+            return
+        
         metric = PerformanceMetric(
-            operation=operation,
-            start_time=time.time(),
-            memory_start=self._get_memory_usage(),
+            # Operation names repeat for every query/batch; share one string object
+            operation=sys.intern(operation),
+            start_time=time.perf_counter(),
+            memory_start=self._get_memory_usage() if self.sample_memory else None,
             metadata=metadata
         )
         
-        # Store as active operation
-        op_key = f"{operation}_{id(metric)}"
-        self.active_operations[op_key] = metric
-        
         try:
             yield metric
         finally:
             # Complete the measurement
-            metric.end_time = time.time()
-            metric.memory_end = self._get_memory_usage()
+            metric.end_time = time.perf_counter()
             metric.duration = metric.end_time - metric.start_time
-            if metric.memory_end and metric.memory_start:
-                metric.memory_delta = metric.memory_end - metric.memory_start
+            if self.sample_memory:
+                metric.memory_end = self._get_memory_usage()
+                if metric.memory_end and metric.memory_start:
+                    metric.memory_delta = metric.memory_end - metric.memory_start
+                self._record_memory(metric.memory_end)
             
-            # Remove from active and add to completed metrics
-            self.active_operations.pop(op_key, None)
+            # Add to completed metrics
             self.metrics.append(metric)
+            if metric.duration:
+                self._record_duration(metric)
             
             # Log slow operations
             if metric.duration and metric.duration > 10.0:  # Log operations > 10 seconds
-                logger.info(f"Slow operation: {operation} took {metric.duration:.2f}s")
+                logger.info("Slow operation: %s took %.2fs", operation, metric.duration)
+                
+    def _record_duration(self, metric: PerformanceMetric):
+        """Fold one measurement into the running aggregates and the slowest-operations heap."""
+        operation, duration = metric.operation, metric.duration
+        with self._lock:
+            _fold_duration(self._operation_totals, operation, duration)
+            for category in _report_categories(operation):
+                _fold_duration(self._category_totals, category, duration)
+            entry = (duration, next(self._slowest_seq), metric)
+            if len(self._slowest) < SLOWEST_OPERATIONS:
+                heapq.heappush(self._slowest, entry)
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
                 
     def increment_counter(self, counter_name: str, amount: int = 1):
         """Increment a named counter."""
-        self.counters[counter_name] = self.counters.get(counter_name, 0) + amount
+        with self._lock:
+            self.counters[counter_name] = self.counters.get(counter_name, 0) + amount
         
     def get_operation_stats(self, operation_pattern: str) -> Dict[str, Any]:
         """
@@ -187,18 +301,21 @@ class PerformanceMonitor:
         Returns:
             Dictionary with timing statistics
         """
-        matching_ops = [m for m in self.metrics if operation_pattern in m.operation and m.duration]
+        # Scans distinct operation names, not every measurement
+        matching = [totals for operation, totals in self._operation_totals.items()
+                    if operation_pattern in operation]
         
-        if not matching_ops:
+        if not matching:
             return {"count": 0, "total_time": 0, "avg_time": 0, "min_time": 0, "max_time": 0}
             
-        durations = [op.duration for op in matching_ops]
+        count = sum(totals[0] for totals in matching)
+        total_time = sum(totals[1] for totals in matching)
         return {
-            "count": len(matching_ops),
-            "total_time": sum(durations),
-            "avg_time": sum(durations) / len(durations),
-            "min_time": min(durations),
-            "max_time": max(durations)
+            "count": count,
+            "total_time": total_time,
+            "avg_time": total_time / count,
+            "min_time": min(totals[2] for totals in matching),
+            "max_time": max(totals[3] for totals in matching)
         }
         
     def generate_report(self, total_queries: int = 0) -> EvaluationPerformanceReport:
@@ -216,36 +333,26 @@ class PerformanceMonitor:
             
         total_duration = self.end_time - self.start_time
         
-        # Calculate timing breakdowns
-        # Get all RAG-related operations (rag_api_single_query, rag_batch_processing, etc.)
-        rag_operations = [m for m in self.metrics if any(term in m.operation for term in ["rag_api", "rag_batch", "rag_responses"]) and m.duration]
-        rag_total_time = sum(op.duration for op in rag_operations)
-        rag_api_stats = {"total_time": rag_total_time, "count": len(rag_operations)}
-        
-        # Get all RAGAS-related operations (ragas_eval_*, batch_eval_*)
-        ragas_operations = [m for m in self.metrics if any(term in m.operation for term in ["ragas_eval", "batch_eval"]) and m.duration]
-        ragas_total_time = sum(op.duration for op in ragas_operations)
-        ragas_eval_stats = {"total_time": ragas_total_time, "count": len(ragas_operations)}
+        # Calculate timing breakdowns from the per-category aggregates kept by _record_duration
+        category_time = {category: totals[1] for category, totals in self._category_totals.items()}
         
         # Build metrics breakdown
-        metrics_breakdown = {}
-        for metric_name in ["faithfulness", "answer_relevancy", "context_precision", "context_relevancy", 
-                           "answer_similarity", "answer_correctness", "context_recall"]:
-            stats = self.get_operation_stats(metric_name)
-            if stats["count"] > 0:
-                metrics_breakdown[metric_name] = stats["total_time"]
+        metrics_breakdown = {category: total_time for category, total_time in category_time.items()
+                             if category not in ("rag", "ragas")}
         
         report = EvaluationPerformanceReport(
             total_queries=total_queries,
             total_duration=total_duration,
             avg_query_time=total_duration / max(total_queries, 1),
-            rag_api_total_time=rag_api_stats["total_time"],
-            ragas_eval_total_time=ragas_eval_stats["total_time"],
+            rag_api_total_time=category_time.get("rag", 0),
+            ragas_eval_total_time=category_time.get("ragas", 0),
             peak_memory_mb=self.peak_memory,
             openai_api_calls=self.counters.get("openai_api_calls", 0),
             failed_operations=self.counters.get("failed_operations", 0),
             metrics_breakdown=metrics_breakdown,
-            operation_timings=self.metrics.copy()
+            operation_timings=list(self.metrics),
+            operation_count=sum(int(totals[0]) for totals in self._operation_totals.values()),
+            slowest_operations=[entry[2] for entry in sorted(self._slowest, key=lambda entry: entry[0], reverse=True)]
         )
         
         return report
@@ -255,12 +362,15 @@ class PerformanceMonitor:
         if not self.start_time or not self.end_time:
             logger.warning("Cannot log summary - monitoring not properly started/stopped")
             return
+        # The report is only built for this log line
+        if not logger.isEnabledFor(logging.INFO):
+            return
             
         report = self.generate_report(total_queries)
         
-        logger.info(f"Performance: {report.total_duration:.1f}s total, {report.avg_query_time:.1f}s/query, "
-                   f"RAG: {report.rag_api_total_time:.1f}s, RAGAS: {report.ragas_eval_total_time:.1f}s, "
-                   f"Memory: {report.peak_memory_mb:.0f}MB")
+        logger.info("Performance: %.1fs total, %.1fs/query, RAG: %.1fs, RAGAS: %.1fs, Memory: %.0fMB",
+                    report.total_duration, report.avg_query_time, report.rag_api_total_time,
+                    report.ragas_eval_total_time, report.peak_memory_mb)
         
     def save_report_to_file(self, filepath: str, total_queries: int = 0):
         """Save performance report to JSON file."""
@@ -271,8 +381,12 @@ class PerformanceMonitor:
             "performance_report": report.to_dict()
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(report_data, f, indent=2)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(report_data, f, indent=2)
             
         logger.info(f"Performance report saved to: {filepath}")
 
@@ -0,0 +1,243 @@
+"""
+Persistent response cache for RAG evaluation.
+
+This module stores successful RAG API responses in a local SQLite database,
+keyed by knowledge base and normalized query, so that repeated evaluation
+runs over the same query suite can skip the RAG round-trip entirely.
+Near-duplicate queries can optionally be matched by cosine similarity of
+lightweight hashed character-trigram vectors.
+
+Payloads are stored as zlib-compressed JSON. The database usually lives in a
+shared user location, so it must never hold anything that executes code when
+loaded (such as pickles). zlib is used instead of zstd to stay within the
+standard library.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import zlib
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("rag_evaluation")
+
+DEFAULT_CACHE_PATH = os.path.expanduser(
+    os.getenv("RAG_EVAL_CACHE_PATH", "~/.cache/akvo-rag-eval.db")
+)
+
+# Entries are only shared between runs using the same tag (e.g. RAG model or KB version)
+DEFAULT_CACHE_TAG = os.getenv("RAG_EVAL_CACHE_TAG") or None
+
+# Dimension of the hashed trigram vectors used for near-duplicate lookups
+QUERY_VECTOR_DIM = 512
+
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return query.strip().lower()
+
+
+def query_hash(query: str) -> str:
+    """Return the 128-bit BLAKE2b hex digest of the normalized query."""
+    return hashlib.blake2b(
+        normalize_query(query).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def query_numbers(query: str) -> str:
+    """Return the numbers in a query, in order, as one space-separated string.
+
+    Trigram similarity barely notices a changed year or amount ("2022" vs
+    "2023"), so near-duplicate matches also require identical numbers.
+    """
+    return " ".join(_NUMBER_PATTERN.findall(normalize_query(query)))
+
+
+def query_vector(query: str) -> np.ndarray:
+    """Embed a query as an L2-normalized bag of hashed character trigrams.
+
+    This is a dependency-free stand-in for a sentence embedding model: it
+    catches rephrasings that share most of their wording (punctuation,
+    word order, small edits), not paraphrases with different vocabulary.
+    """
+    text = f"  {normalize_query(query)} "
+    vector = np.zeros(QUERY_VECTOR_DIM, dtype=np.float32)
+    for i in range(len(text) - 2):
+        vector[zlib.crc32(text[i : i + 3].encode("utf-8")) % QUERY_VECTOR_DIM] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class ResponseCache:
+    """SQLite-backed cache of RAG responses keyed by (kb_name, query hash)."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: Optional[int] = None,
+        tag: Optional[str] = DEFAULT_CACHE_TAG,
+    ):
+        """Open (and create if needed) the cache database.
+
+        Args:
+            path: Location of the SQLite database file
+            ttl_seconds: Entries older than this are treated as misses (None keeps them forever)
+            tag: Version label stored with every entry; entries written under a
+                different tag are never returned, so bumping it invalidates the cache
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.tag = tag
+        # kb_name -> (query hashes, query numbers, stacked query vectors), built lazily
+        # on first lookup
+        self._vector_index: Dict[str, Tuple[list, np.ndarray, np.ndarray]] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path)
+        # WAL lets concurrent evaluation runs read while another one writes
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rag_responses ("
+            "kb_name TEXT NOT NULL, "
+            "query_hash TEXT NOT NULL, "
+            "payload BLOB NOT NULL, "
+            "ts INTEGER NOT NULL, "
+            "PRIMARY KEY (kb_name, query_hash))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rag_query_vectors ("
+            "kb_name TEXT NOT NULL, "
+            "query_hash TEXT NOT NULL, "
+            "vector BLOB NOT NULL, "
+            "numbers TEXT, "
+            "PRIMARY KEY (kb_name, query_hash))"
+        )
+        # Databases created before the numbers column existed; their rows keep NULL
+        # and are never returned as near duplicates
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(rag_query_vectors)")}
+        if "numbers" not in columns:
+            self.conn.execute("ALTER TABLE rag_query_vectors ADD COLUMN numbers TEXT")
+        self.conn.commit()
+
+    def get(self, kb_name: str, query: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached RAG response.
+
+        Args:
+            kb_name: Name of the knowledge base the response was generated from
+            query: Query string
+
+        Returns:
+            The cached response dictionary, or None on a miss or expired entry
+        """
+        return self._load(self._namespace(kb_name), query_hash(query))
+
+    def get_similar(
+        self, kb_name: str, query: str, threshold: float = 0.95
+    ) -> Optional[Dict[str, Any]]:
+        """Look up the cached response of the most similar earlier query.
+
+        Only earlier queries containing exactly the same numbers are considered,
+        since trigram similarity cannot tell e.g. "rainfall in 2022" from
+        "rainfall in 2023" (cosine ~0.97).
+
+        Args:
+            kb_name: Name of the knowledge base the response was generated from
+            query: Query string
+            threshold: Minimum cosine similarity for a match
+
+        Returns:
+            The cached response dictionary, or None if nothing is similar enough
+        """
+        kb_name = self._namespace(kb_name)
+        if kb_name not in self._vector_index:
+            rows = self.conn.execute(
+                "SELECT query_hash, vector, numbers FROM rag_query_vectors "
+                "WHERE kb_name = ? AND numbers IS NOT NULL",
+                (kb_name,),
+            ).fetchall()
+            hashes = [row[0] for row in rows]
+            numbers = np.array([row[2] for row in rows], dtype=object)
+            matrix = (
+                np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+                if rows
+                else np.empty((0, QUERY_VECTOR_DIM), dtype=np.float32)
+            )
+            self._vector_index[kb_name] = (hashes, numbers, matrix)
+
+        hashes, numbers, matrix = self._vector_index[kb_name]
+        candidates = np.flatnonzero(numbers == query_numbers(query))
+        if not candidates.size:
+            return None
+
+        # Vectors are unit length, so the dot product is the cosine similarity
+        scores = matrix[candidates] @ query_vector(query)
+        best_pos = int(np.argmax(scores))
+        if scores[best_pos] < threshold:
+            return None
+
+        logger.info(
+            f"Near-duplicate cache hit for '{query[:50]}' (similarity {scores[best_pos]:.3f})"
+        )
+        return self._load(kb_name, hashes[candidates[best_pos]])
+
+    def _namespace(self, kb_name: str) -> str:
+        """Scope a knowledge base name to the cache tag."""
+        return f"{kb_name}\0{self.tag}" if self.tag else kb_name
+
+    def _load(self, kb_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Read and decode one cache entry, honouring the TTL."""
+        row = self.conn.execute(
+            "SELECT payload, ts FROM rag_responses WHERE kb_name = ? AND query_hash = ?",
+            (kb_name, key),
+        ).fetchone()
+        if row is None:
+            return None
+
+        payload, ts = row
+        if self.ttl_seconds is not None and time.time() - ts > self.ttl_seconds:
+            return None
+
+        try:
+            return json.loads(zlib.decompress(payload))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {str(e)}")
+            return None
+
+    def set(self, kb_name: str, query: str, result: Dict[str, Any]) -> None:
+        """Store a RAG response, replacing any previous entry for the query.
+
+        Args:
+            kb_name: Name of the knowledge base the response was generated from
+            query: Query string
+            result: Response dictionary as returned by RagChatUtil
+        """
+        kb_name = self._namespace(kb_name)
+        key = query_hash(query)
+        payload = zlib.compress(json.dumps(result).encode("utf-8"))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO rag_responses (kb_name, query_hash, payload, ts) "
+            "VALUES (?, ?, ?, ?)",
+            (kb_name, key, payload, int(time.time())),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO rag_query_vectors (kb_name, query_hash, vector, numbers) "
+            "VALUES (?, ?, ?, ?)",
+            (kb_name, key, query_vector(query).tobytes(), query_numbers(query)),
+        )
+        self.conn.commit()
+        # Rebuilt from the database on the next similarity lookup
+        self._vector_index.pop(kb_name, None)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
@@ -103,8 +103,8 @@ def main():
         "--openai-api-key", type=str, help="OpenAI API key for evaluation"
     )
     parser.add_argument(
-        "--openai-model", type=str, default="gpt-4o", 
-        help="OpenAI model to use for evaluation (default: gpt-4o)"
+        "--openai-model", type=str, default="gpt-4o-mini", 
+        help="OpenAI model to use for evaluation (default: gpt-4o-mini)"
     )
     
     args = parser.parse_args()
@@ -149,7 +149,7 @@ def main():
         if args.queries:
             try:
                 with open(args.queries, 'r') as f:
-                    queries = [line.strip() for line in f if line.strip()]
+                    queries = [query for line in f if (query := line.strip())]
                 logger.info(f"Loaded {len(queries)} queries from {args.queries}")
             except Exception as e:
                 logger.error(f"Error loading queries from {args.queries}: {e}")
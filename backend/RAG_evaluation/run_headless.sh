@@ -12,6 +12,7 @@
 #   -m METRICS_MODE             Metrics mode: basic (4), full (8), reference-only (4) (default: full)
 #   --docker-host-gateway       Replace localhost with host.docker.internal (for Mac users etc.)
 #   --save-performance-report   Save performance report to JSON file (default: false)
+#   --use-cache                 Reuse RAG responses cached by earlier runs (default: false)
 
 # Navigate to script's parent directory
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -39,6 +40,7 @@ OUTPUT_FILE=""
 METRICS_MODE="full"
 USE_DOCKER_HOST_GATEWAY=false
 SAVE_PERFORMANCE_REPORT=false
+USE_CACHE=false
 
 # First, manually check for long options
 for arg in "$@"; do
@@ -50,6 +52,10 @@ for arg in "$@"; do
         SAVE_PERFORMANCE_REPORT=true
         # Remove from arguments to avoid conflict with getopts
         set -- "${@/--save-performance-report/}"
+    elif [[ "$arg" == "--use-cache" ]]; then
+        USE_CACHE=true
+        # Remove from arguments to avoid conflict with getopts
+        set -- "${@/--use-cache/}"
     fi
 done
 
@@ -130,4 +136,12 @@ docker exec \
     -e OUTPUT_FILE="$OUTPUT_FILE" \
     -e METRICS_MODE="$METRICS_MODE" \
     -e SAVE_PERFORMANCE_REPORT="$SAVE_PERFORMANCE_REPORT" \
+    -e RAG_EVAL_CONCURRENCY="${RAG_EVAL_CONCURRENCY:-3}" \
+    -e RAG_EVAL_RAGAS_WORKERS="${RAG_EVAL_RAGAS_WORKERS:-16}" \
+    -e RAG_EVAL_RAGAS_CHUNKS="${RAG_EVAL_RAGAS_CHUNKS:-1}" \
+    -e RAG_EVAL_USE_CACHE="$USE_CACHE" \
+    -e RAG_EVAL_CACHE_TAG="${RAG_EVAL_CACHE_TAG:-}" \
+    -e RAG_EVAL_PERF_MONITORING="${RAG_EVAL_PERF_MONITORING:-true}" \
+    -e RAG_EVAL_PERF_MEMORY="${RAG_EVAL_PERF_MEMORY:-true}" \
+    -e RAG_EVAL_MEMORY_SAMPLE_INTERVAL="${RAG_EVAL_MEMORY_SAMPLE_INTERVAL:-0}" \
     $CONTAINER_NAME bash -c "cd /app/RAG_evaluation && source venv/bin/activate && python run_headless_evaluation.py $*"
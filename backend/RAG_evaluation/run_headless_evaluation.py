@@ -5,79 +5,91 @@ Headless RAG evaluation runner script.
 This script runs RAG evaluation with configurable parameters.
 """
 
+import argparse
 import sys
 import os
 import json
-import pandas as pd
-from headless_evaluation import run_headless_evaluation
+from datetime import datetime
+import numpy as np
+from chat_util import dump_logs
+from headless_evaluation import parse_csv_queries_fast, run_headless_evaluation
+
+
+class NumpyJSONEncoder(json.JSONEncoder):
+    """JSON encoder that converts numpy scalars and arrays to native Python types."""
+
+    def default(self, obj):
+        if isinstance(obj, np.integer):
+            return int(obj)
+        elif isinstance(obj, np.floating):
+            return float(obj)
+        elif isinstance(obj, np.bool_):
+            return bool(obj)
+        elif isinstance(obj, np.ndarray):
+            return obj.tolist()
+        return super().default(obj)
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments; defaults come from the environment set by run_headless.sh."""
+    parser = argparse.ArgumentParser(description='Run headless RAG evaluation')
+    parser.add_argument('--kb', default=os.getenv('KB_NAME', 'Living Income Benchmark Knowledge Base'),
+                        help='Knowledge base to evaluate')
+    parser.add_argument('--openai-model', default='gpt-4o-mini', help='OpenAI model used for evaluation')
+    parser.add_argument('--output', default=os.getenv('OUTPUT_FILE', ''), help='CSV output file or directory')
+    parser.add_argument('--metrics-mode', default=os.getenv('METRICS_MODE', 'full'),
+                        help='Metrics mode: basic, full or reference-only')
+    parser.add_argument('--use-cache', dest='use_cache', action='store_true',
+                        help='Reuse RAG responses cached by earlier runs')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help='Always query the RAG API')
+    parser.add_argument('--cache-dir', default='', help='Directory holding the response cache')
+    parser.add_argument('--cache-tag', default=None, help='Only reuse responses cached under this tag')
+    parser.add_argument('--logs-file', default='', help='Write the RAG API logs to this JSON Lines file')
+    parser.set_defaults(use_cache=os.getenv('RAG_EVAL_USE_CACHE', 'false').lower() == 'true')
+    # run_headless.sh forwards its leftover arguments verbatim; ignore anything unknown as before
+    args, _ = parser.parse_known_args(argv)
+    return args
 
 
 def main():
     """Main function to run headless evaluation with command-line arguments."""
-    # Default values (can be overridden by environment variables or script parameters)
-    kb_name = 'Living Income Benchmark Knowledge Base'
-    openai_model = 'gpt-4o'
-    output_file = ''
-    username = 'admin@example.com'
-    password = 'password'
-    rag_api_url = 'http://localhost:8000'
-    csv_file = ''
-    metrics_mode = 'full'
+    args = parse_args()
+    kb_name = args.kb
+    openai_model = args.openai_model
+    output_file = args.output
+    metrics_mode = args.metrics_mode
+    use_cache = args.use_cache
+    cache_dir = args.cache_dir
+    cache_tag = args.cache_tag
+    logs_file = args.logs_file
     queries = None
     reference_answers = None
-    save_performance_report = False
 
     # Get values from environment (set by shell script)
-    kb_name = os.getenv('KB_NAME', kb_name)
-    username = os.getenv('USERNAME', username)
-    password = os.getenv('PASSWORD', password)
-    rag_api_url = os.getenv('RAG_API_URL', rag_api_url)
-    csv_file = os.getenv('CSV_FILE', csv_file)
-    output_file = os.getenv('OUTPUT_FILE', output_file)
-    metrics_mode = os.getenv('METRICS_MODE', metrics_mode)
+    username = os.getenv('USERNAME', 'admin@example.com')
+    password = os.getenv('PASSWORD', 'password')
+    rag_api_url = os.getenv('RAG_API_URL', 'http://localhost:8000')
+    csv_file = os.getenv('CSV_FILE', '')
     save_performance_report = os.getenv('SAVE_PERFORMANCE_REPORT', 'false').lower() == 'true'
 
     # Load queries and reference answers from CSV if provided
     if csv_file and csv_file.strip():
         try:
             print(f'Loading queries from CSV file: {csv_file}')
-            df = pd.read_csv(csv_file)
-            if 'prompt' in df.columns:
-                queries = df['prompt'].tolist()
-                print(f'Loaded {len(queries)} queries from CSV')
-                
-                # Check for reference answers
-                if 'reference' in df.columns:
-                    reference_answers = df['reference'].tolist()
-                    print(f'Loaded {len(reference_answers)} reference answers from CSV')
-                else:
-                    print('No reference answers found in CSV (no "reference" column)')
-            else:
-                print('Error: CSV file must have a "prompt" column')
+            queries, reference_answers, parse_error = parse_csv_queries_fast(csv_file)
+            if parse_error:
+                print(f'Error: {parse_error}')
                 sys.exit(1)
+            print(f'Loaded {len(queries)} queries from CSV')
+            if reference_answers:
+                print(f'Loaded {len(reference_answers)} reference answers from CSV')
+            else:
+                print('No reference answers found in CSV')
         except Exception as e:
             print(f'Error loading CSV file: {e}')
             sys.exit(1)
 
-    # Parse command line arguments
-    args = sys.argv[1:]
-    i = 0
-    while i < len(args):
-        if args[i] == '--kb' and i+1 < len(args):
-            kb_name = args[i+1]
-            i += 2
-        elif args[i] == '--openai-model' and i+1 < len(args):
-            openai_model = args[i+1]
-            i += 2
-        elif args[i] == '--output' and i+1 < len(args):
-            output_file = args[i+1]
-            i += 2
-        elif args[i] == '--metrics-mode' and i+1 < len(args):
-            metrics_mode = args[i+1]
-            i += 2
-        else:
-            i += 1
-
     # Validate metrics mode
     valid_modes = ['basic', 'full', 'reference-only']
     if metrics_mode not in valid_modes:
@@ -92,6 +104,8 @@ def main():
     print(f'Metrics mode: {metrics_mode}')
     if output_file:
         print(f'CSV output will be saved to: {output_file}')
+    if use_cache:
+        print(f'Reusing cached RAG responses{" from " + cache_dir if cache_dir else ""}')
     if queries:
         print(f'Using {len(queries)} queries from CSV file')
     else:
@@ -119,30 +133,20 @@ def main():
         password=password,
         rag_api_url=rag_api_url,
         metrics_mode=metrics_mode,
-        save_performance_report=save_performance_report
+        save_performance_report=save_performance_report,
+        use_cache=use_cache,
+        cache_path=os.path.join(cache_dir, 'rag_responses.db') if cache_dir else None,
+        cache_tag=cache_tag
     )
 
-    # Output results with JSON serialization fix
-    def convert_numpy_types(obj):
-        """Convert numpy types to native Python types for JSON serialization"""
-        import numpy as np
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {key: convert_numpy_types(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_numpy_types(item) for item in obj]
-        return obj
-    
-    # Convert results to handle numpy types
-    serializable_results = convert_numpy_types(results)
-    
+    # Stream the RAG API logs to a JSON Lines file if requested
+    if logs_file:
+        try:
+            dump_logs(logs_file, results.get('logs', []))
+            print(f'Logs saved to: {logs_file}')
+        except Exception as e:
+            print(f'Warning: Failed to write logs file: {str(e)}')
+
     # Handle CSV output if requested
     if output_file and output_file.strip():
         # Import CSV processor
@@ -160,7 +164,6 @@ def main():
                     # Handle output path
                     if output_file.endswith('/') or output_file == '.':
                         # If output is a directory, generate default filename
-                        from datetime import datetime
                         os.makedirs(output_file, exist_ok=True)
                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                         filename = f"rag_evaluation_results_{timestamp}.csv"
@@ -184,7 +187,9 @@ def main():
     
     # Always output JSON results to stdout for backward compatibility
     if not output_file:
-        print(json.dumps(serializable_results, indent=2))
+        # Always the stdlib encoder, so the output format (e.g. NaN scores) never
+        # depends on which optional serializers are installed
+        print(json.dumps(results, indent=2, cls=NumpyJSONEncoder))
     else:
         print('Evaluation completed successfully')
 
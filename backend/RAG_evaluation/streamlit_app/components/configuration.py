@@ -84,18 +84,6 @@ class ConfigurationManager:
         
         # Performance settings in expander
         with st.sidebar.expander("⚡ Performance Settings", expanded=False):
-            use_batch_processing = st.checkbox(
-                "Enable Batch Processing", 
-                value=True,
-                help="Process multiple queries concurrently for 50-70% speed improvement"
-            )
-            
-            batch_size = st.slider(
-                "Batch Size", 
-                min_value=1, max_value=10, value=5,
-                help="Number of queries per batch (higher = faster but more memory)"
-            )
-            
             max_concurrent = st.slider(
                 "Max Concurrent", 
                 min_value=1, max_value=8, value=3,
@@ -115,8 +103,6 @@ class ConfigurationManager:
             "kb_name": kb_name,
             "openai_api_key": openai_api_key,
             "openai_model": openai_model,
-            "use_batch_processing": use_batch_processing,
-            "batch_size": batch_size,
             "max_concurrent": max_concurrent,
         }
 
@@ -13,7 +13,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from utils.session_state import SessionStateManager
 from utils.csv_handling import CSVProcessor
-from constants import UI_MESSAGES
+from constants import CSV_COLUMNS, UI_MESSAGES
 
 
 class QueryInputManager:
@@ -63,8 +63,8 @@ class QueryInputManager:
                     st.error(f"File validation failed: {error_msg}")
                     return [], None
                 
-                # Parse CSV
-                df = pd.read_csv(uploaded_file)
+                # Parse CSV (only the prompt/reference columns, kept as text)
+                df = pd.read_csv(uploaded_file, usecols=lambda col: col in CSV_COLUMNS, dtype=str)
                 uploaded_queries, uploaded_references, parse_error = CSVProcessor.parse_csv_queries(df)
                 
                 if parse_error:
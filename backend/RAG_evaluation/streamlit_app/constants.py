@@ -60,9 +60,12 @@ REFERENCE_BASED_METRICS: set = {
     'context_recall'
 }
 
-# CSV column mapping
+# CSV column mapping; same names and priority as PROMPT_COLUMNS / REFERENCE_COLUMNS
+# in headless_evaluation.py
 CSV_PROMPT_COLUMNS: List[str] = ['prompt', 'query', 'question']
-CSV_REFERENCE_COLUMNS: List[str] = ['reference_answer', 'reference', 'answer', 'expected_answer']
+CSV_REFERENCE_COLUMNS: List[str] = ['reference_answer', 'reference', 'ground_truth', 'answer', 'expected_answer']
+# Uploaded CSVs are parsed for these columns only
+CSV_COLUMNS = frozenset(CSV_PROMPT_COLUMNS + CSV_REFERENCE_COLUMNS)
 
 # Default configuration values
 DEFAULT_CONFIG: Dict[str, Any] = {
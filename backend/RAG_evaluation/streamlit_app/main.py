@@ -176,15 +176,18 @@ async def run_evaluation_async(config, queries, reference_answers):
     status_text = st.empty()
     status_text.text(UI_MESSAGES['evaluation_starting'])
     
+    completed = set()
+    
     def update_progress(i, total, query, result):
-        progress_bar.progress((i + 1) / total)
-        status_text.text(f"Processing query {i+1}/{total}: {query[:50]}...")
+        # Queries finish in completion order, so count them rather than using the index
+        completed.add(i)
+        progress_bar.progress(len(completed) / total)
+        status_text.text(f"Completed query {len(completed)}/{total}: {query[:50]}...")
         
         # Update results in session state
-        if len(st.session_state.results) <= i:
-            st.session_state.results.append(result)
-        else:
-            st.session_state.results[i] = result
+        while len(st.session_state.results) <= i:
+            st.session_state.results.append(None)
+        st.session_state.results[i] = result
     
     def update_ragas_status(message):
         status_text.text(message)
@@ -210,8 +213,6 @@ async def run_evaluation_async(config, queries, reference_answers):
             metrics_mode=evaluation_mode,
             progress_callback=update_progress,
             ragas_status_callback=update_ragas_status,
-            use_batch_processing=config.get('use_batch_processing', True),
-            batch_size=config.get('batch_size', 5),
             max_concurrent=config.get('max_concurrent', 3)
         )
         
@@ -0,0 +1,363 @@
+"""
+Unit tests for headless_evaluation helpers that do not need the RAG API or OpenAI.
+"""
+
+import asyncio
+
+import pytest
+
+import headless_evaluation
+from performance_monitor import get_monitor, reset_monitor
+from response_cache import ResponseCache
+
+
+class FakeRagChatUtil:
+    """Stand-in for RagChatUtil that answers every query locally."""
+
+    calls = []
+    instances = 0
+    sessions = 0
+    kb_lookups = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeRagChatUtil.instances += 1
+
+    async def __aenter__(self):
+        FakeRagChatUtil.sessions += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def aclose(self):
+        pass
+
+    def enable_instrumentation(self):
+        pass
+
+    def drain_logs(self):
+        return []
+
+    async def get_knowledge_base_by_name(self, kb_name):
+        FakeRagChatUtil.kb_lookups += 1
+        return {"id": 1, "name": kb_name}
+
+    async def generate_rag_response(self, query, kb_name, kb=None):
+        FakeRagChatUtil.calls.append(query)
+        return {"response": f"fresh answer to {query}", "contexts": ["fresh context"]}
+
+
+@pytest.fixture
+def fake_chat_util(monkeypatch):
+    FakeRagChatUtil.calls = []
+    FakeRagChatUtil.instances = FakeRagChatUtil.sessions = FakeRagChatUtil.kb_lookups = 0
+    monkeypatch.setattr(headless_evaluation, "RagChatUtil", FakeRagChatUtil)
+    return FakeRagChatUtil
+
+
+def _seed_cache(path, tag):
+    cache = ResponseCache(path=path, tag=tag)
+    cache.set("KB", "What is a living income?", {
+        "response": "cached answer", "contexts": ["cached context"]
+    })
+    cache.close()
+
+
+def test_generate_rag_responses_uses_default_cache_tag(tmp_path, monkeypatch, fake_chat_util):
+    path = str(tmp_path / "cache.db")
+    _seed_cache(path, tag="model-a")
+    monkeypatch.setattr(headless_evaluation, "DEFAULT_CACHE_TAG", "model-a")
+
+    results, _ = asyncio.run(headless_evaluation.generate_rag_responses(
+        ["What is a living income?"], "KB", use_cache=True, cache_path=path
+    ))
+
+    assert results[0]["answer"] == "cached answer"
+    assert fake_chat_util.calls == []
+
+
+def test_generate_rag_responses_misses_cache_under_other_tag(tmp_path, monkeypatch, fake_chat_util):
+    path = str(tmp_path / "cache.db")
+    _seed_cache(path, tag="model-a")
+    monkeypatch.setattr(headless_evaluation, "DEFAULT_CACHE_TAG", "model-b")
+
+    results, _ = asyncio.run(headless_evaluation.generate_rag_responses(
+        ["What is a living income?"], "KB", use_cache=True, cache_path=path
+    ))
+
+    assert results[0]["answer"] == "fresh answer to What is a living income?"
+    assert fake_chat_util.calls == ["What is a living income?"]
+
+
+def test_generate_rag_responses_turns_raising_query_into_error_row(monkeypatch, fake_chat_util):
+    async def generate_rag_response(self, query, kb_name, kb=None):
+        if query == "boom":
+            raise RuntimeError("connection reset")
+        return {"response": f"fresh answer to {query}", "contexts": ["fresh context"]}
+
+    monkeypatch.setattr(fake_chat_util, "generate_rag_response", generate_rag_response)
+
+    results, _ = asyncio.run(headless_evaluation.generate_rag_responses(["q1", "boom", "q2"], "KB"))
+
+    assert [result["query"] for result in results] == ["q1", "boom", "q2"]
+    assert results[1]["error"] == "connection reset"
+    assert results[0]["answer"] == "fresh answer to q1"
+    assert results[2]["answer"] == "fresh answer to q2"
+
+
+def test_generate_rag_responses_stops_when_kb_is_missing(monkeypatch, fake_chat_util):
+    async def get_knowledge_base_by_name(self, kb_name):
+        return None
+
+    monkeypatch.setattr(fake_chat_util, "get_knowledge_base_by_name", get_knowledge_base_by_name)
+
+    results, _ = asyncio.run(headless_evaluation.generate_rag_responses(["q1", "q2", "q1"], "Missing KB"))
+
+    assert [result["error"] for result in results] == ["Knowledge base 'Missing KB' not found"] * 3
+    assert [result["query"] for result in results] == ["q1", "q2", "q1"]
+    assert fake_chat_util.calls == []
+
+
+def test_run_headless_evaluation_refuses_running_loop():
+    async def call_from_coroutine():
+        headless_evaluation.run_headless_evaluation("KB", queries=["q"])
+
+    with pytest.raises(RuntimeError, match="await evaluate_queries"):
+        asyncio.run(call_from_coroutine())
+
+
+def test_evaluate_queries_starts_a_fresh_monitoring_session(monkeypatch, fake_chat_util):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    asyncio.run(headless_evaluation.evaluate_queries(["What is a living income?"], "KB"))
+    first = get_monitor()
+
+    asyncio.run(headless_evaluation.evaluate_queries(["What is a living income?"], "KB"))
+
+    # A second call never adds its numbers to the previous run's stopped session
+    assert get_monitor() is not first
+    assert get_monitor().generate_report(1).total_duration >= 0
+
+
+def test_evaluate_queries_can_keep_callers_monitoring_session(monkeypatch, fake_chat_util):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    reset_monitor()
+    monitor = get_monitor()
+    monitor.start_monitoring()
+    session_start = monitor.start_time
+
+    results = asyncio.run(headless_evaluation.evaluate_queries(
+        ["What is a living income?"], "KB", reset_monitoring=False
+    ))
+
+    assert get_monitor() is monitor
+    assert monitor.start_time == session_start
+    assert results["rag_results"][0]["answer"] == "fresh answer to What is a living income?"
+
+
+EVALUATION_CSV = (
+    'id,question,ground_truth,notes\n'
+    '1,"What is a living income, and who sets it?","A decent standard of living, set per region",x\n'
+    '\n'
+    '2,  How is it measured?  ,,\n'
+    '3,"   ",ignored,\n'
+    '\n'
+    '4,"Compare Kenya, Ghana and Côte d\'Ivoire","Benchmarks differ, see ""Table 2""",y\n'
+)
+
+
+def test_parse_csv_queries_fast_pyarrow_matches_pandas(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "queries.csv"
+    path.write_text(EVALUATION_CSV, encoding="utf-8")
+
+    with_pyarrow = headless_evaluation.parse_csv_queries_fast(str(path))
+    monkeypatch.setattr(headless_evaluation, "_PYARROW_AVAILABLE", False)
+    with_pandas = headless_evaluation.parse_csv_queries_fast(str(path))
+
+    assert with_pyarrow == with_pandas
+    assert with_pandas == (
+        ["What is a living income, and who sets it?", "How is it measured?",
+         "Compare Kenya, Ghana and Côte d'Ivoire"],
+        ["A decent standard of living, set per region", "", 'Benchmarks differ, see "Table 2"'],
+        None,
+    )
+
+
+def test_evaluate_queries_streams_one_generation_run_into_ragas_chunks(monkeypatch, fake_chat_util):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    scored = []
+
+    def fake_run_ragas_evaluation(evaluation_data, **kwargs):
+        scored.append([row["query"] for row in evaluation_data])
+        return {"success": True, "metrics": {"faithfulness": [0.5] * len(evaluation_data)},
+                "metric_names": ["faithfulness"], "errors": []}
+
+    monkeypatch.setattr(headless_evaluation, "run_ragas_evaluation", fake_run_ragas_evaluation)
+    queries = [f"q{i}" for i in range(21)] + ["q0"]
+
+    results = asyncio.run(headless_evaluation.evaluate_queries(queries, "KB", pipeline_batch_size=10))
+
+    # One session, one login and one KB lookup for the whole run, each distinct query sent once
+    assert (fake_chat_util.instances, fake_chat_util.sessions, fake_chat_util.kb_lookups) == (1, 1, 1)
+    assert sorted(fake_chat_util.calls) == sorted(set(queries))
+    assert [len(chunk) for chunk in scored] == [10, 10, 2]
+    assert sorted(query for chunk in scored for query in chunk) == sorted(queries)
+    assert [row["query"] for row in results["rag_results"]] == queries
+    assert all(row["faithfulness"] == 0.5 for row in results["rag_results"])
+
+
+class FakeDataset:
+    """Minimal EvaluationDataset: a list of sample dicts."""
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def __len__(self):
+        return len(self.samples)
+
+
+class FakeEvaluationResult:
+    """Per-metric score columns, indexed like a RAGAS EvaluationResult."""
+
+    def __init__(self, columns):
+        self._columns = columns
+        self.scores = [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def __getitem__(self, key):
+        return self._columns[key]
+
+
+def _samples(*queries):
+    return [{"user_input": q, "response": f"answer to {q}", "retrieved_contexts": ["ctx"], "reference": ""}
+            for q in queries]
+
+
+@pytest.fixture
+def fake_ragas(monkeypatch):
+    """Run _evaluate_unified_metrics_batch against a scripted evaluate()."""
+    calls = []
+    # fail_metrics: raise when any of these is requested; nan: metric -> queries scored NaN;
+    # transient: forget the NaN queries after the first call; batches: queries of each call
+    behaviour = {"fail_metrics": set(), "nan": {}, "transient": False, "batches": [], "llms": []}
+
+    def fake_evaluate(dataset, metrics, llm, embeddings, run_config):
+        calls.append(list(metrics))
+        behaviour["llms"].append(llm)
+        behaviour["batches"].append([sample["user_input"] for sample in dataset.samples])
+        if behaviour["fail_metrics"] & set(metrics):
+            raise RuntimeError("metric blew up")
+        columns = {}
+        for metric in metrics:
+            key = headless_evaluation._RAGAS_SCORE_KEYS[metric]
+            columns[key] = [
+                float("nan") if sample["user_input"] in behaviour["nan"].get(metric, ()) else 0.5
+                for sample in dataset.samples
+            ]
+        if behaviour["transient"]:
+            behaviour["nan"] = {}
+        return FakeEvaluationResult(columns)
+
+    monkeypatch.setattr(headless_evaluation, "evaluate", fake_evaluate, raising=False)
+    monkeypatch.setattr(headless_evaluation, "EvaluationDataset", FakeDataset, raising=False)
+    monkeypatch.setattr(headless_evaluation, "_metric_for", lambda metric, llm, emb=None: metric)
+    monkeypatch.setattr(headless_evaluation, "_ragas_run_config", lambda: None)
+    return calls, behaviour
+
+
+def test_unified_batch_bisects_to_isolate_failing_metric(fake_ragas):
+    calls, behaviour = fake_ragas
+    behaviour["fail_metrics"] = {"context_recall"}
+    metrics = ["faithfulness", "answer_relevancy", "context_precision", "context_recall"]
+
+    results, errors = headless_evaluation._evaluate_unified_metrics_batch(
+        FakeDataset(_samples("q1", "q2")), None, metrics
+    )
+
+    assert sorted(results) == ["answer_relevancy", "context_precision", "faithfulness"]
+    assert results["faithfulness"] == [0.5, 0.5]
+    assert len(errors) == 1 and "metric blew up" in errors[0]
+    assert calls == [metrics, metrics[:2], metrics[2:], ["context_precision"], ["context_recall"]]
+
+
+def test_unified_batch_keeps_scored_samples_next_to_nan(fake_ragas):
+    _, behaviour = fake_ragas
+    behaviour["nan"] = {"faithfulness": {"q2"}}
+
+    results, errors = headless_evaluation._evaluate_unified_metrics_batch(
+        FakeDataset(_samples("q1", "q2")), None, ["faithfulness", "answer_relevancy"]
+    )
+
+    assert results == {"faithfulness": [0.5, None], "answer_relevancy": [0.5, 0.5]}
+    assert errors == []
+
+
+def test_batches_retry_only_nan_cells_once(fake_ragas):
+    calls, behaviour = fake_ragas
+    # q2's faithfulness is scored NaN by the first pass only; the recovery pass fixes it
+    behaviour["nan"] = {"faithfulness": {"q2"}}
+    behaviour["transient"] = True
+    samples = _samples("q1", "q2", "q3")
+
+    results, successful, errors = headless_evaluation.evaluate_metrics_in_batches(
+        FakeDataset(samples), samples, None, ["faithfulness", "answer_relevancy"], True, False, "model",
+        batch_size=3
+    )
+
+    assert successful == ["faithfulness", "answer_relevancy"]
+    assert results["faithfulness"] == [0.5, 0.5, 0.5]
+    assert errors == []
+    assert calls == [["faithfulness", "answer_relevancy"], ["faithfulness"]]
+    assert behaviour["batches"] == [["q1", "q2", "q3"], ["q2"]]
+
+
+def test_batches_report_unscored_samples_individually(fake_ragas):
+    _, behaviour = fake_ragas
+    behaviour["nan"] = {"faithfulness": {"q3"}, "answer_relevancy": {"q1", "q2", "q3", "q4"}}
+    samples = _samples("q1", "q2", "q3", "q4")
+
+    results, successful, errors = headless_evaluation.evaluate_metrics_in_batches(
+        FakeDataset(samples), samples, None, ["faithfulness", "answer_relevancy"], True, False, "model",
+        batch_size=2
+    )
+
+    # One NaN sample doesn't remove faithfulness; a metric no sample got a score for is failed
+    assert successful == ["faithfulness"]
+    assert results == {"faithfulness": [0.5, 0.5, None, 0.5]}
+    assert "faithfulness: no valid score for sample 3 ('q3')" in errors
+    assert "answer_relevancy: no valid scores" in errors
+
+
+def test_batches_build_fresh_models_for_every_evaluate_call(fake_ragas):
+    _, behaviour = fake_ragas
+    made = []
+
+    def model_factory():
+        made.append(object())
+        return made[-1], None
+
+    samples = _samples("q1", "q2", "q3")
+    headless_evaluation.evaluate_metrics_in_batches(
+        FakeDataset(samples), samples, None, ["faithfulness"], True, False, "model", batch_size=2,
+        model_factory=model_factory
+    )
+
+    # RAGAS runs each evaluate() on a new event loop, so no LLM client is shared between calls
+    assert len(made) == 2
+    assert behaviour["llms"] == made
+
+
+class FakeMetric:
+    def __init__(self):
+        self.llm = self.embeddings = self.answer_similarity = None
+
+
+def test_metric_for_rebinds_cached_instance_to_new_models(monkeypatch):
+    monkeypatch.setattr(headless_evaluation, "_METRIC_CLASSES", {"answer_correctness": FakeMetric})
+    monkeypatch.setattr(headless_evaluation, "_METRIC_INSTANCES", {})
+
+    first = headless_evaluation._metric_for("answer_correctness", "llm-1", "emb-1")
+    first.answer_similarity = "similarity built from emb-1"
+    second = headless_evaluation._metric_for("answer_correctness", "llm-2", None)
+
+    assert second is first
+    assert (second.llm, second.embeddings, second.answer_similarity) == ("llm-2", None, None)
@@ -0,0 +1,120 @@
+"""
+Unit tests for the persistent RAG response cache.
+"""
+
+import pickle
+import sqlite3
+import zlib
+
+import pytest
+
+import response_cache
+from response_cache import ResponseCache, query_hash
+
+RESULT = {"response": "A living income is ...", "contexts": [{"page_content": "ctx"}], "response_time": 1.5}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def test_get_returns_what_set_stored(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    cache.set("KB", "What is a living income?", RESULT)
+
+    assert cache.get("KB", "What is a living income?") == RESULT
+    # Lookups are normalized for case and surrounding whitespace
+    assert cache.get("KB", "  what is a living income?  ") == RESULT
+    assert cache.get("KB", "Another question") is None
+    assert cache.get("Other KB", "What is a living income?") is None
+
+
+def test_entries_survive_reopening(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    cache.set("KB", "q", RESULT)
+    cache.close()
+
+    assert ResponseCache(path=cache_path, tag=None).get("KB", "q") == RESULT
+
+
+def test_payload_is_json_not_pickle(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    cache.set("KB", "q", RESULT)
+    cache.close()
+
+    payload = sqlite3.connect(cache_path).execute("SELECT payload FROM rag_responses").fetchone()[0]
+    assert zlib.decompress(payload).startswith(b"{")
+
+
+def test_pickled_entries_are_never_loaded(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    cache.conn.execute(
+        "INSERT INTO rag_responses (kb_name, query_hash, payload, ts) VALUES (?, ?, ?, ?)",
+        ("KB", query_hash("q"), zlib.compress(pickle.dumps(RESULT)), 0),
+    )
+
+    assert cache.get("KB", "q") is None
+
+
+def test_ttl_expires_old_entries(cache_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(path=cache_path, ttl_seconds=60, tag=None)
+    cache.set("KB", "q", RESULT)
+
+    now[0] += 30
+    assert cache.get("KB", "q") == RESULT
+    now[0] += 60
+    assert cache.get("KB", "q") is None
+    # Without a TTL the same entry is still served
+    assert ResponseCache(path=cache_path, tag=None).get("KB", "q") == RESULT
+
+
+def test_tags_namespace_entries(cache_path):
+    ResponseCache(path=cache_path, tag="model-a").set("KB", "q", RESULT)
+
+    assert ResponseCache(path=cache_path, tag="model-a").get("KB", "q") == RESULT
+    assert ResponseCache(path=cache_path, tag="model-b").get("KB", "q") is None
+    assert ResponseCache(path=cache_path, tag=None).get("KB", "q") is None
+
+
+def test_get_similar_matches_near_duplicates(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    cache.set("KB", "What is the living income benchmark for Kenya?", RESULT)
+
+    assert cache.get_similar("KB", "What is the living income benchmark for Kenya", 0.9) == RESULT
+    assert cache.get_similar("KB", "How are cocoa prices set?", 0.9) is None
+    assert cache.get_similar("Other KB", "What is the living income benchmark for Kenya", 0.9) is None
+
+
+def test_get_similar_sees_entries_added_after_first_lookup(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    assert cache.get_similar("KB", "What is a living income?", 0.9) is None
+
+    cache.set("KB", "What is a living income?", RESULT)
+    assert cache.get_similar("KB", "what is a living income", 0.9) == RESULT
+
+
+def test_get_similar_requires_matching_numbers(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    cache.set("KB", "What was the total rainfall in Kenya during 2022 according to the report?", RESULT)
+
+    assert cache.get_similar(
+        "KB", "What was the total rainfall in Kenya during 2023 according to the report?", 0.95
+    ) is None
+    assert cache.get_similar(
+        "KB", "What was the total rainfall in Kenya during 2022, according to the report", 0.95
+    ) == RESULT
+
+
+def test_get_similar_ignores_rows_from_older_databases(cache_path):
+    cache = ResponseCache(path=cache_path, tag=None)
+    cache.set("KB", "What is a living income?", RESULT)
+    # Rows written before the numbers column existed have no numbers recorded
+    cache.conn.execute("UPDATE rag_query_vectors SET numbers = NULL")
+    cache.conn.commit()
+
+    reopened = ResponseCache(path=cache_path, tag=None)
+    assert reopened.get_similar("KB", "what is a living income", 0.9) is None
+    assert reopened.get("KB", "What is a living income?") == RESULT